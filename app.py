@@ -142,7 +142,8 @@ if st.session_state["raw_results"] is not None and not st.session_state["raw_res
     st.header("Filter Results (Post-Processing)")
     st.caption("Refine the search results without re-running AI.")
     
-    df = st.session_state["raw_results"].copy()
+    # Read-only below: every filter step returns a new frame, so no copy is needed
+    df = st.session_state["raw_results"]
     
     # Task 2: Post-Filtering Section
     col1, col2, col3, col4 = st.columns(4)
@@ -176,7 +177,7 @@ if st.session_state["raw_results"] is not None and not st.session_state["raw_res
             st.caption(f"Showing {res_count} result")
     
     # Apply Post Filters (Instant)
-    filtered_df = df.copy()
+    filtered_df = df
     
     if post_level != "Any":
         filtered_df = filtered_df[filtered_df['level'] == post_level]
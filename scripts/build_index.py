@@ -2,21 +2,24 @@ import os
 import pandas as pd
 import numpy as np
 import faiss
-from sentence_transformers import SentenceTransformer
 import sys
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from src.config import settings
+from src.ai.embeddings import EmbeddingService
+
 def build_index():
     print("Starting Production Index Build...")
     
     # Configuration
     DATA_PATH = "data/courses.csv"
-    MODEL_NAME = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+    MODEL_NAME = settings.EMBEDDING_MODEL_NAME
     OUTPUT_PARQUET = "data/courses_clean.parquet"
     OUTPUT_EMBEDDINGS = "data/course_embeddings.npy"
-    OUTPUT_FAISS = "data/faiss.index"
+    # Each embedding backend gets its own index, built from its own vectors
+    OUTPUT_FAISS = str(settings.faiss_index_file)
 
     if not os.path.exists(DATA_PATH):
         print(f"Error: {DATA_PATH} not found.")
@@ -45,12 +48,17 @@ def build_index():
         df['instructor'].fillna('')
     ).str.lower()
 
-    # 4. Compute embeddings
-    print(f"Loading model: {MODEL_NAME}...")
-    model = SentenceTransformer(MODEL_NAME)
+    # 4. Compute embeddings with the same backend that will encode queries
+    print(f"Loading model: {MODEL_NAME} ({settings.EMBEDDING_BACKEND} backend)...")
+    service = EmbeddingService()
+    if service.can_encode:
+        service.load_model()
+    if not service.can_encode:
+        print(f"Error: the {settings.EMBEDDING_BACKEND} embedding backend is not available.")
+        return
     
     print("Computing embeddings (this may take a few minutes)...")
-    embeddings = model.encode(df['combined_text'].tolist(), show_progress_bar=True)
+    embeddings = service.encode(df['combined_text'].tolist())
     embeddings = np.array(embeddings).astype('float32')
 
     # 5. Save artifacts
@@ -0,0 +1,38 @@
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.report.pdf_renderer import _ENV, TEMPLATE_NAME, TEMPLATE_SOURCE, TEMPLATE_SOURCE_HASH
+
+OUTPUT_MODULE = os.path.join("src", "report", "_dashboard_tpl.py")
+
+def compile_templates():
+    """
+    Compile the dashboard template ahead of time into a plain Python module.
+    pdf_renderer imports it at startup instead of parsing the template; rerun
+    this script whenever HTML_TEMPLATE or DASHBOARD_CSS changes.
+    """
+    print(f"Compiling {TEMPLATE_NAME}...")
+    code = _ENV.compile(
+        TEMPLATE_SOURCE,
+        name=TEMPLATE_NAME,
+        filename=TEMPLATE_NAME,
+        raw=True,
+        # Render functions read `environment` from module globals, which
+        # Template.from_module_dict fills in at load time
+        defer_init=True
+    )
+
+    header = (
+        "# Generated by scripts/compile_templates.py -- do not edit.\n"
+        f"SOURCE_HASH = {TEMPLATE_SOURCE_HASH!r}\n"
+    )
+    with open(OUTPUT_MODULE, "w", encoding="utf-8") as f:
+        f.write(header + code + "\n")
+
+    print(f"Wrote {OUTPUT_MODULE}")
+
+if __name__ == "__main__":
+    compile_templates()
@@ -0,0 +1,27 @@
+import argparse
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.ai.engine import prune_embedding_caches
+from src.config import settings
+
+def main():
+    """
+    Delete old CourseRecommender embedding caches, keeping the most recent
+    dataset keys per model. Run it when no worker still needs the old ones.
+    """
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--keep", type=int, default=3, help="dataset keys to keep per model (default: 3)")
+    parser.add_argument("--dir", default=str(settings.EMBEDDINGS_CACHE_DIR), help="cache directory")
+    args = parser.parse_args()
+
+    removed = prune_embedding_caches(args.dir, keep=args.keep)
+    for name in removed:
+        print(f"Removed {name}")
+    print(f"Removed {len(removed)} cache file(s) from {args.dir}")
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,14 @@ try:
 except ImportError:
     HAS_ML = False
 
+try:
+    from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+    HAS_ONNX = True
+except ImportError:
+    HAS_ONNX = False
+
 import numpy as np
 from typing import List, Union
 from src.config import settings
@@ -11,21 +19,41 @@ from src.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Same truncation as the SentenceTransformer config of the default model
+ONNX_MAX_SEQ_LENGTH = 128
+
 class EmbeddingService:
     _instance = None
     _model = None
     _reranker = None
+    _onnx_model = None
+    _tokenizer = None
+    _onnx_attempted = False
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(EmbeddingService, cls).__new__(cls)
-            cls._instance.can_encode = HAS_ML
+            if settings.EMBEDDING_BACKEND == "onnx":
+                # The ONNX backend only needs optimum/onnxruntime, not torch
+                cls._instance.can_encode = HAS_ONNX
+            else:
+                cls._instance.can_encode = HAS_ML
         return cls._instance
 
     def load_model(self):
-        """Lazy load the embedding model."""
+        """Lazy load the embedding model for the configured backend."""
+        if settings.EMBEDDING_BACKEND == "onnx":
+            # No torch fallback: its vectors don't match the ONNX-built index
+            if not self._onnx_attempted:
+                self._onnx_attempted = True
+                self._load_onnx_model()
+                if self._onnx_model is None:
+                    self.can_encode = False
+            return
+
         if not HAS_ML:
             logger.warning("ML libraries (torch/sentence-transformers) not found. Semantic search disabled.")
+            self.can_encode = False
             return
 
         if self._model is None:
@@ -37,6 +65,60 @@ class EmbeddingService:
                 self.can_encode = False
                 raise
 
+    def _load_onnx_model(self):
+        """
+        Load the int8-quantized ONNX export, exporting it first if it isn't
+        on disk yet (the export itself needs torch; loading it does not).
+        """
+        if not HAS_ONNX:
+            logger.warning("optimum[onnxruntime] not found. Semantic search disabled.")
+            return
+
+        export_dir = settings.ONNX_MODEL_DIR / settings.EMBEDDING_MODEL_NAME.replace("/", "__")
+        quantized_file = export_dir / "model_quantized.onnx"
+        try:
+            if not quantized_file.exists():
+                logger.info(f"Exporting {settings.EMBEDDING_MODEL_NAME} to ONNX at {export_dir}")
+                model = ORTModelForFeatureExtraction.from_pretrained(settings.EMBEDDING_MODEL_NAME, export=True)
+                model.save_pretrained(export_dir)
+                AutoTokenizer.from_pretrained(settings.EMBEDDING_MODEL_NAME).save_pretrained(export_dir)
+
+                # Dynamic int8 quantization of the MatMul weights
+                quantizer = ORTQuantizer.from_pretrained(model)
+                qconfig = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+                quantizer.quantize(save_dir=export_dir, quantization_config=qconfig)
+
+            self._tokenizer = AutoTokenizer.from_pretrained(export_dir)
+            self._onnx_model = ORTModelForFeatureExtraction.from_pretrained(export_dir, file_name=quantized_file.name)
+            logger.info("Loaded quantized ONNX embedding model.")
+        except Exception as e:
+            logger.error(f"Failed to load ONNX embedding model, semantic search disabled: {e}")
+            self._onnx_model = None
+            self._tokenizer = None
+
+    def _encode_onnx(self, texts: List[str]) -> np.ndarray:
+        """Mean-pooled embeddings from the ONNX model, batched by token length."""
+        batch_size = settings.EMBEDDING_BATCH_SIZE
+        # Sort by length so every batch is padded to its own max, not the model max
+        order = np.argsort([-len(t) for t in texts], kind="stable")
+        embeddings = np.empty((len(texts), self._onnx_model.config.hidden_size), dtype=np.float32)
+
+        for start in range(0, len(texts), batch_size):
+            batch_idx = order[start:start + batch_size]
+            inputs = self._tokenizer(
+                [texts[i] for i in batch_idx],
+                padding=True,
+                truncation=True,
+                max_length=ONNX_MAX_SEQ_LENGTH,
+                return_tensors="np"
+            )
+            token_embeddings = self._onnx_model(**inputs).last_hidden_state
+            mask = inputs["attention_mask"][..., None].astype(np.float32)
+            summed = (token_embeddings * mask).sum(axis=1)
+            embeddings[batch_idx] = summed / np.clip(mask.sum(axis=1), 1e-9, None)
+
+        return embeddings
+
     def load_reranker(self):
         """Lazy load the reranker model."""
         if not HAS_ML:
@@ -51,14 +133,18 @@ class EmbeddingService:
                 pass
 
     def encode(self, texts: Union[str, List[str]]) -> np.ndarray:
+        if self.can_encode:
+            self.load_model()
         if not self.can_encode:
             # Should not be called if can_encode is False, but let's be safe
             return np.zeros((1, 384)) if isinstance(texts, str) else np.zeros((len(texts), 384))
             
-        self.load_model()
         if isinstance(texts, str):
             texts = [texts]
         
+        if self._onnx_model is not None:
+            return self._encode_onnx(texts)
+
         embeddings = self._model.encode(texts, convert_to_numpy=True)
         return embeddings
 
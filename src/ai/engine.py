@@ -1,25 +1,109 @@
 ﻿import os
+import re
+import tempfile
+from functools import lru_cache
 import pandas as pd
 import numpy as np
 from typing import List, Dict, Any, Optional, Tuple
 try:
     from sentence_transformers import SentenceTransformer
-    from sklearn.metrics.pairwise import cosine_similarity
 except ImportError:
     SentenceTransformer = None
-    cosine_similarity = None
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
+
+from src.utils import load_courses, format_course_texts, get_dataset_hash, get_dataset_hash_from_path
+from src.ai.ranker import top_k_indices
+from src.config import settings
+
+# Bump whenever format_course_texts changes what gets embedded, so cached
+# matrices built from the old text are not reused
+EMBEDDING_TEXT_VERSION = 2
+# Course and query vectors are L2-normalized at encode time
+NORMALIZE_EMBEDDINGS = True
+# Distinct query strings whose embeddings each recommender keeps in memory
+QUERY_EMBEDDING_CACHE_SIZE = 256
+
+def _quantize_int8(unit_vectors: np.ndarray) -> np.ndarray:
+    """Quantize unit-length float vectors to int8 with a fixed scale of 127."""
+    return np.clip(np.rint(unit_vectors * 127), -127, 127).astype(np.int8)
+
+def _save_npy_atomic(path: str, array: np.ndarray) -> None:
+    """
+    Write an .npy next to its final path and rename it into place, so
+    processes that have the old file memory-mapped never see it truncated.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".npy.tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, array)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
 
-from src.utils import load_courses, format_course_text
+# embeddings_<model slug>_<hex dataset hash>[_t<ver>_<norm|raw>][.i8].npy
+# (caches written before the version suffix have none)
+_EMBEDDINGS_FILE_RE = re.compile(r"embeddings_(?P<model>.+)_(?P<key>[0-9a-f]+(?:_t\d+_(?:norm|raw))?)(?:\.i8)?\.npy")
+
+def prune_embedding_caches(cache_dir: Optional[str] = None, keep: int = 3) -> List[str]:
+    """
+    Maintenance step (scripts/prune_embedding_caches.py): per model, keep the
+    `keep` most recently written cache keys (float32 file plus int8 sidecar)
+    and delete older ones. Never run automatically, since workers on other
+    datasets may still be using their caches. Returns the removed file names.
+    """
+    cache_dir = str(cache_dir or settings.EMBEDDINGS_CACHE_DIR)
+    if not os.path.isdir(cache_dir):
+        return []
+
+    # model -> key -> [(name, mtime)]
+    by_model: Dict[str, Dict[str, List[Tuple[str, float]]]] = {}
+    for name in os.listdir(cache_dir):
+        match = _EMBEDDINGS_FILE_RE.fullmatch(name)
+        if match:
+            mtime = os.path.getmtime(os.path.join(cache_dir, name))
+            by_model.setdefault(match["model"], {}).setdefault(match["key"], []).append((name, mtime))
+
+    removed = []
+    for keys in by_model.values():
+        newest_first = sorted(keys.values(), key=lambda files: max(m for _, m in files), reverse=True)
+        for files in newest_first[keep:]:
+            for name, _ in files:
+                try:
+                    os.remove(os.path.join(cache_dir, name))
+                    removed.append(name)
+                except OSError as e:
+                    print(f"Warning: Could not remove stale embeddings {name} ({e}).")
+    return removed
 
 class CourseRecommender:
-    def __init__(self, model_name: str = 'all-MiniLM-L6-v2'):
+    def __init__(self, model_name: str = 'all-MiniLM-L6-v2', use_int8: bool = False):
         """
         Initialize the Course Recommender system.
+        use_int8 scores queries against an int8-quantized copy of the
+        embeddings (4x less memory traffic); requires simsimd.
         """
         self.model_name = model_name
+        self.use_int8 = use_int8
         self.model = None
         self.courses_df = None
         self.embeddings = None
+        self.embeddings_i8 = None
+        self.dataset_hash = None
+        # Row positions per level / category, used for the hard pre-filters
+        self._level_idx: Dict[str, np.ndarray] = {}
+        self._cat_idx: Dict[str, np.ndarray] = {}
+        # Lowercased course texts and word -> row positions, for the keyword guardrail
+        self._texts_lower: Optional[pd.Series] = None
+        self._keyword_index: Dict[str, np.ndarray] = {}
+        # Per-instance so cached vectors never outlive (or leak across) models
+        self._encode_query = lru_cache(maxsize=QUERY_EMBEDDING_CACHE_SIZE)(self._encode_query_uncached)
         
         # Fallback data
         self.fallback_data = [
@@ -84,12 +168,69 @@ class CourseRecommender:
         try:
             print(f"Attempting to load courses from {csv_path}...")
             self.courses_df = load_courses(csv_path)
+            # Keyed on file metadata; no need to hash the data itself
+            self.dataset_hash = get_dataset_hash_from_path(csv_path)
             print(f"Loaded {len(self.courses_df)} courses from CSV.")
         except Exception as e:
             print(f"Warning: Could not load CSV ({e}). Using fallback data.")
             self.courses_df = pd.DataFrame(self.fallback_data)
+            self.dataset_hash = get_dataset_hash(self.courses_df)
         
+        self.courses_df = self.courses_df.reset_index(drop=True)
+        self._build_filter_index()
         self._compute_embeddings()
+        self._prepare_int8_embeddings()
+        self._build_keyword_index()
+
+    def _build_filter_index(self) -> None:
+        """Precompute row positions for each level and category value."""
+        self._level_idx = {}
+        self._cat_idx = {}
+        if 'level' in self.courses_df.columns:
+            for lvl, g in self.courses_df.groupby('level', sort=False, observed=True):
+                self._level_idx[lvl] = g.index.to_numpy()
+        if 'category' in self.courses_df.columns:
+            for cat, g in self.courses_df.groupby('category', sort=False, observed=True):
+                self._cat_idx[cat] = g.index.to_numpy()
+
+    def _build_keyword_index(self) -> None:
+        """Map every lowercase word in the course texts to the rows containing it."""
+        self._texts_lower = None
+        self._keyword_index = {}
+        if 'combined_text' not in self.courses_df.columns:
+            return
+        self._texts_lower = self.courses_df['combined_text'].astype(str).str.lower()
+        tokens = self._texts_lower.str.findall(r"\w+").explode().dropna()
+        pairs = pd.DataFrame({'token': tokens.to_numpy(), 'row': tokens.index.to_numpy()}).drop_duplicates()
+        self._keyword_index = {
+            tok: rows.to_numpy(dtype=np.int32)
+            for tok, rows in pairs.groupby('token', sort=False)['row']
+        }
+
+    def _pre_filter_positions(self, pre_filters: Optional[Dict[str, Any]]) -> np.ndarray:
+        """Resolve the hard pre-filters to sorted row positions in courses_df."""
+        empty = np.empty(0, dtype=np.int64)
+        selected = []
+        if pre_filters:
+            if 'level' in pre_filters and pre_filters['level'] != "Any":
+                selected.append(self._level_idx.get(pre_filters['level'], empty))
+            if 'category' in pre_filters and pre_filters['category'] != "Any":
+                selected.append(self._cat_idx.get(pre_filters['category'], empty))
+
+        if selected:
+            # Start from the smallest group and intersect with the others
+            selected.sort(key=len)
+            positions = selected[0]
+            for other in selected[1:]:
+                positions = np.intersect1d(positions, other, assume_unique=True)
+        else:
+            positions = np.arange(len(self.courses_df))
+
+        if pre_filters and 'max_duration' in pre_filters and 'duration_hours' in self.courses_df.columns:
+            durations = self.courses_df['duration_hours'].to_numpy()[positions]
+            positions = positions[durations <= pre_filters['max_duration']]
+
+        return np.sort(positions)
 
     def _compute_embeddings(self) -> None:
         """Compute embeddings for all courses."""
@@ -97,17 +238,116 @@ class CourseRecommender:
             print("No courses to embed.")
             return
 
-        self.courses_df['combined_text'] = self.courses_df.apply(format_course_text, axis=1)
+        self.courses_df['combined_text'] = format_course_texts(self.courses_df)
         
         self._initialize_model()
         
         if self.model:
+            emb_path = self._embeddings_path()
+            if os.path.exists(emb_path):
+                print(f"Loading cached embeddings from {emb_path}...")
+                self.embeddings = self._load_embeddings(emb_path)
+                if len(self.embeddings) == len(self.courses_df):
+                    return
+                print("Cached embeddings do not match the dataset. Recomputing...")
+
             print("Computing embeddings...")
-            self.embeddings = self.model.encode(self.courses_df['combined_text'].tolist(), show_progress_bar=True)
+            embeddings = self.model.encode(
+                self.courses_df['combined_text'].tolist(),
+                show_progress_bar=True,
+                normalize_embeddings=NORMALIZE_EMBEDDINGS
+            ).astype(np.float32, copy=False)
             print("Embeddings computed.")
+
+            try:
+                os.makedirs(settings.EMBEDDINGS_CACHE_DIR, exist_ok=True)
+                _save_npy_atomic(emb_path, embeddings)
+                self.embeddings = self._load_embeddings(emb_path)
+            except OSError as e:
+                print(f"Warning: Could not cache embeddings ({e}).")
+                self.embeddings = embeddings
         else:
             print("Warning: SentenceTransformer not available. Embeddings not computed.")
 
+    def _model_slug(self) -> str:
+        return self.model_name.replace("/", "__")
+
+    def _embeddings_path(self) -> str:
+        """Cache file for the current dataset, model, text format and normalization."""
+        norm = "norm" if NORMALIZE_EMBEDDINGS else "raw"
+        name = f"embeddings_{self._model_slug()}_{self.dataset_hash}_t{EMBEDDING_TEXT_VERSION}_{norm}.npy"
+        return os.path.join(settings.EMBEDDINGS_CACHE_DIR, name)
+
+    @staticmethod
+    def _load_embeddings(emb_path: str) -> np.ndarray:
+        """
+        Memory-map the cached matrix so the OS pages rows in on demand and
+        several worker processes share one copy. Set EMBEDDINGS_MMAP=0 to
+        load it fully into RAM instead.
+        """
+        if os.environ.get("EMBEDDINGS_MMAP", "1") == "0":
+            return np.load(emb_path)
+        try:
+            embeddings = np.load(emb_path, mmap_mode='r')
+        except (OSError, ValueError) as e:
+            # e.g. filesystems that don't support mmap
+            print(f"Warning: Could not memory-map embeddings ({e}). Loading into RAM.")
+            return np.load(emb_path)
+        print(f"Memory-mapped {os.path.getsize(emb_path) / 1e6:.1f} MB of embeddings.")
+        return embeddings
+
+    def _prepare_int8_embeddings(self) -> None:
+        """
+        Build (or load the cached) int8 copy of the unit-length embeddings,
+        stored next to the float32 cache with an .i8.npy suffix.
+        """
+        self.embeddings_i8 = None
+        if not self.use_int8 or self.embeddings is None:
+            return
+        if simsimd is None:
+            print("Warning: use_int8 needs simsimd; scoring with float32 embeddings.")
+            return
+
+        i8_path = self._embeddings_path()[:-len(".npy")] + ".i8.npy"
+        if os.path.exists(i8_path):
+            embeddings_i8 = self._load_embeddings(i8_path)
+            if embeddings_i8.shape == self.embeddings.shape:
+                self.embeddings_i8 = embeddings_i8
+                return
+
+        # Rows are unit length, so one fixed scale maps them onto [-127, 127]
+        # and cosine (being scale-invariant) needs no per-row scale
+        embeddings_i8 = _quantize_int8(self.embeddings)
+        try:
+            os.makedirs(settings.EMBEDDINGS_CACHE_DIR, exist_ok=True)
+            _save_npy_atomic(i8_path, embeddings_i8)
+        except OSError as e:
+            print(f"Warning: Could not cache int8 embeddings ({e}).")
+        self.embeddings_i8 = embeddings_i8
+
+    def _encode_query_uncached(self, text: str) -> np.ndarray:
+        """Unit-length float32 query embedding, read-only since it is shared via the cache."""
+        vector = np.asarray(self.model.encode([text], normalize_embeddings=NORMALIZE_EMBEDDINGS)[0], dtype=np.float32)
+        vector.setflags(write=False)
+        return vector
+
+    def _cosine_scores(self, query_embedding: np.ndarray) -> np.ndarray:
+        """
+        Cosine similarity of a unit-length query against every course row.
+        Uses SimSIMD's SIMD kernels when installed (reads the mmapped matrix
+        in place), on the int8 copy if enabled; otherwise a NumPy
+        matrix-vector product.
+        """
+        if self.embeddings_i8 is not None:
+            query = _quantize_int8(query_embedding)
+            dists = np.asarray(simsimd.cdist(query[None, :], self.embeddings_i8, metric="cosine"))
+            return 1.0 - dists.ravel()
+        if simsimd is not None:
+            query = np.ascontiguousarray(query_embedding, dtype=self.embeddings.dtype)
+            dists = np.asarray(simsimd.cdist(query[None, :], self.embeddings, metric="cosine"))
+            return 1.0 - dists.ravel()
+        return self.embeddings @ query_embedding
+
     def recommend(
         self, 
         user_query: str, 
@@ -136,17 +376,8 @@ class CourseRecommender:
             return {"results": [], "debug_info": debug_info}
 
         # --- 1. Apply Pre-Run Hard Filters ---
-        filtered_df = self.courses_df.copy()
-        
-        if pre_filters:
-            if 'level' in pre_filters and pre_filters['level'] != "Any":
-                filtered_df = filtered_df[filtered_df['level'] == pre_filters['level']]
-            
-            if 'category' in pre_filters and pre_filters['category'] != "Any":
-                filtered_df = filtered_df[filtered_df['category'] == pre_filters['category']]
-                
-            if 'max_duration' in pre_filters and 'duration_hours' in filtered_df.columns:
-                 filtered_df = filtered_df[filtered_df['duration_hours'] <= pre_filters['max_duration']]
+        positions = self._pre_filter_positions(pre_filters)
+        filtered_df = self.courses_df.iloc[positions]
 
         debug_info["pre_filter_count"] = len(filtered_df)
 
@@ -163,9 +394,17 @@ class CourseRecommender:
         
         missing_keywords = []
         if keywords:
-            # Check availability in the *filtered* dataset text
-            all_text_blob = " ".join(filtered_df['combined_text'].str.lower().tolist())
+            # Check availability in the *filtered* dataset text. A keyword that is a
+            # whole word in a filtered course is found via the index; anything else
+            # (partial words, symbols like c++) falls back to a substring scan.
+            is_filtered = len(positions) < len(self.courses_df)
+            all_text_blob = None
             for kw in keywords:
+                rows = self._keyword_index.get(kw)
+                if rows is not None and (not is_filtered or np.isin(rows, positions).any()):
+                    continue
+                if all_text_blob is None:
+                    all_text_blob = " ".join(self._texts_lower.iloc[positions].tolist())
                 if kw not in all_text_blob:
                     missing_keywords.append(kw)
         
@@ -178,64 +417,47 @@ class CourseRecommender:
 
 
         # --- Semantic Search ---
-        current_indices = filtered_df.index.tolist()
+        current_indices = filtered_df.index.to_numpy()
         results = []
         
         if self.model and self.embeddings is not None and len(self.embeddings) == len(self.courses_df):
-            # 1. Compute Query Embedding (Freshly computed, no caching)
-            query_embedding = self.model.encode([user_query])
+            # 1. Compute Query Embedding (unit length, so a dot product is the cosine)
+            query_embedding = self._encode_query(user_query)
             
-            # 2. Slice Embeddings
-            subset_embeddings = self.embeddings[current_indices]
+            # 2. Score every row in one pass instead of copying the filtered subset
+            similarities = self._cosine_scores(query_embedding)
+            if len(current_indices) < len(similarities):
+                mask = np.zeros(len(similarities), dtype=bool)
+                mask[current_indices] = True
+                similarities[~mask] = -np.inf
             
-            # 3. Cosine Similarity
-            similarities = cosine_similarity(query_embedding, subset_embeddings)[0]
-            
-            # 4. Filter by Threshold
-            # We only care about indices where score >= threshold
-            # Mapping back to the subset index
+            # 3. Filter by Threshold (-inf rows never pass)
             valid_mask = similarities >= similarity_threshold
             
             if not np.any(valid_mask):
                 # No results pass threshold
                 # Add top scores to debug anyway for visibility
-                top_debug_indices = np.argsort(similarities)[::-1][:5]
-                debug_info["top_raw_scores"] = similarities[top_debug_indices].tolist()
+                subset_similarities = similarities[current_indices]
+                top_debug_indices = top_k_indices(subset_similarities, 5)
+                debug_info["top_raw_scores"] = subset_similarities[top_debug_indices].tolist()
                 return {"results": [], "debug_info": debug_info}
             
-            # Filter similarities and indices
-            filtered_similarities = similarities[valid_mask]
-            # Get original indices (subset indices) that are valid
-            # valid_mask is boolean array of shape (subset_len,)
-            # We need the indices of True values
-            valid_subset_indices = np.where(valid_mask)[0]
-            
-            # Sort valid ones
-            # argsort sorts ascending, so we flip
-            sorted_local_indices = valid_subset_indices[np.argsort(filtered_similarities)[::-1]]
-            
-            # Additional capping by top_k
-            top_local_indices = sorted_local_indices[:top_k]
-            
-            # Get final scores
-            # To get scores, we need to index into filtered_similarities? 
-            # Easier: use subset_embeddings indices
-            final_subset_scores = []
-            for local_idx in top_local_indices:
-                final_subset_scores.append(similarities[local_idx])
-            
-            final_subset_scores = np.array(final_subset_scores)
+            # 4. Top-k among valid rows
+            valid_positions = np.flatnonzero(valid_mask)
+            valid_scores = similarities[valid_positions]
+            order = top_k_indices(valid_scores, top_k)
+            top_positions = valid_positions[order]
+            final_scores = valid_scores[order]
             
             # DEBUG: Store top 5 raw scores
-            debug_info["top_raw_scores"] = [float(s) for s in final_subset_scores[:5]]
+            debug_info["top_raw_scores"] = [float(s) for s in final_scores[:5]]
             
             # Calculate Rank 0..10 based on these VALID scores
-            min_score = np.min(final_subset_scores) if len(final_subset_scores) > 0 else 0.0
-            max_score = np.max(final_subset_scores) if len(final_subset_scores) > 0 else 1.0
+            min_score = np.min(final_scores)
+            max_score = np.max(final_scores)
             
-            for local_idx, score in zip(top_local_indices, final_subset_scores):
-                # Retrieve actual course using iloc on filtered_df
-                course = filtered_df.iloc[local_idx].to_dict()
+            for pos, score in zip(top_positions, final_scores):
+                course = self.courses_df.iloc[pos].to_dict()
                 course['similarity_score'] = float(score)
                 
                 # Integer Rank Calculation
@@ -252,10 +474,12 @@ class CourseRecommender:
             print("Using keyword matching fallback.")
             query_lower = user_query.lower()
             
-            def keyword_score(text):
-                return sum(1 for word in query_lower.split() if word in str(text).lower())
-            
-            scores = filtered_df['combined_text'].apply(keyword_score)
+            # Count how many query words occur in each course text, one
+            # vectorised substring scan per word instead of a Python call per row
+            texts_lower = self._texts_lower.iloc[positions]
+            scores = pd.Series(0, index=filtered_df.index)
+            for word in query_lower.split():
+                scores += texts_lower.str.contains(word, regex=False)
             
             # Threshold for keywords: Must have at least 1 match
             scores = scores[scores > 0]
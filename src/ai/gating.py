@@ -1,4 +1,5 @@
 import re
+from functools import lru_cache
 from typing import List, Dict, Any, Tuple
 from src.utils import is_arabic
 from src.config import settings
@@ -13,23 +14,39 @@ STRICT_TECH_KEYWORDS = {
     'finance', 'sales', 'hr', 'management'
 }
 
+# Generic course words that never count as keywords (built once, not per call)
+STOPWORDS = frozenset({
+    'course', 'learn', 'tutorial', 'basics', 'advanced', 'introduction', 
+    'guide', 'complete', 'bootcamp', 'masterclass', 'fundamentals',
+    'beginner', 'intermediate', 'expert', 'programming', 'language'
+})
+
+@lru_cache(maxsize=1024)
+def _keyword_pattern(kw: str) -> "re.Pattern":
+    """
+    Compile the boundary-aware pattern for a keyword once; check_gating runs
+    it against every candidate course.
+    """
+    # If kw starts/ends with a word char, use \b.
+    # Symbols (.net, c++, c#): don't require a start boundary, so "ASP.NET"
+    # still matches ".NET"; at the end use a lookahead so "C#2" fails while
+    # "C#," matches without consuming the following character.
+    pattern_str = r'\b' if re.match(r'\w', kw[0]) else ''
+    pattern_str += re.escape(kw)
+    pattern_str += r'\b' if re.match(r'\w', kw[-1]) else r'(?!\w)'
+    return re.compile(pattern_str, re.IGNORECASE)
+
 def extract_strong_keywords_regex(query: str, is_short: bool = False) -> List[str]:
     """
     Extract strong keywords.
     """
-    stopwords = {
-        'course', 'learn', 'tutorial', 'basics', 'advanced', 'introduction', 
-        'guide', 'complete', 'bootcamp', 'masterclass', 'fundamentals',
-        'beginner', 'intermediate', 'expert', 'programming', 'language'
-    }
-    
     tokens = query.split()
     keywords = []
     
     for t in tokens:
         t_clean = t.lower()
         # Keep if it is in our strict list OR it is not a stopword and len >= 2
-        if t_clean in STRICT_TECH_KEYWORDS or (t_clean not in stopwords and len(t) >= 2):
+        if t_clean in STRICT_TECH_KEYWORDS or (t_clean not in STOPWORDS and len(t) >= 2):
             keywords.append(t)
             
     return keywords
@@ -65,70 +82,24 @@ def check_gating(
         return True, [] 
 
     # 3. Keyword Matching
-    title = str(course.get('title', '')).lower()
-    skills = str(course.get('skills', '')).lower()
-    desc = str(course.get('description', '')).lower()
-    
-    if title == 'nan': title = ''
-    if skills == 'nan': skills = ''
-    if desc == 'nan': desc = ''
+    if 'title_lower' in course:
+        # Precomputed once per dataset by the pipeline
+        title = course['title_lower']
+        skills = course['skills_lower']
+        desc = course['description_lower']
+    else:
+        title = str(course.get('title', '')).lower()
+        skills = str(course.get('skills', '')).lower()
+        desc = str(course.get('description', '')).lower()
+        
+        if title == 'nan': title = ''
+        if skills == 'nan': skills = ''
+        if desc == 'nan': desc = ''
     
     matched = []
     
-    # Helper to check boundary match
     def check_match(text, kw):
-        # Intelligent Boundary Check
-        # If kw starts/ends with word char, use \b. 
-        # If matching symbol (Only special chars allowed are +, #, .), check loose boundary.
-        
-        esc_kw = re.escape(kw)
-        
-        # Start boundary
-        start_bound = r'\b' if re.match(r'\w', kw[0]) else r'(?:^|\s|[^\w])'
-        
-        # End boundary
-        end_bound = r'\b' if re.match(r'\w', kw[-1]) else r'(?:$|\s|[^\w])'
-        
-        # Special case for .net, c++, c#
-        # If matching symbols, we must be careful not to match inside other symbols ideally.
-        # But (?:$|\s|[^\w]) says: End of string OR whitespace OR non-word char.
-        # This works for "C#" followed by "," (comma is non-word).
-        # "C#" followed by " " (space is whitespace).
-        # "C#" followed by "blah" (non-word? NO, b is word).
-        # Wait, [^\w] matches ANY non-word char.
-        # If "C#" is followed by "2" -> "2" is \w. So [^\w] won't match. "C#2" fail. Good.
-        # If "C#" is followed by "," -> "," is [^\w]. Match. Good.
-        
-        # Caveat: [^\w] consumes a character!
-        # If we use Lookahead (?=...) it won't consume.
-        # But re.search doesn't overlap usually incorrectly here.
-        
-        # Better: Use lookarounds or simple checks.
-        # Regex: (?<!\w) for start if starts with word?
-        
-        pattern_str = ""
-        
-        # Start
-        if re.match(r'\w', kw[0]):
-            pattern_str += r'\b'
-        else:
-            # Starts with symbol like .net
-            # Don't match if preceded by word char? e.g. "ASP.NET" vs ".NET"
-            # If user search ".NET", "ASP.NET" should match?
-            # Actually yes, usually.
-            pass
-            
-        pattern_str += esc_kw
-        
-        # End
-        if re.match(r'\w', kw[-1]):
-            pattern_str += r'\b'
-        else:
-            # Ends with symbol like C#
-            # Ensure not followed by word char
-            pattern_str += r'(?!\w)' 
-            
-        return re.search(pattern_str, text, re.IGNORECASE)
+        return _keyword_pattern(kw).search(text)
 
     for kw in keywords:
         if check_match(title, kw) or check_match(skills, kw):
@@ -1,17 +1,23 @@
+import json
+import threading
 import time
-from typing import Dict, Any, List
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
 from src.logger import setup_logger
-from src.schemas import RecommendRequest, RecommendResponse, Recommendation
+from src.schemas import RecommendRequest, RecommendResponse
 from src.data_loader import DataLoader
 from src.ai.embeddings import EmbeddingService
 from src.ai.gating import check_gating
 from src.ai.ranker import normalize_rank_1_10
-from src.utils import normalize_query, is_arabic
+from src.utils import normalize_query, is_arabic, get_dataset_hash_from_path
 from src.config import settings
 from src.ai.gating import extract_strong_keywords_regex, STRICT_TECH_KEYWORDS
 
 logger = setup_logger(__name__)
 
+# Max number of distinct requests whose responses are kept in memory
+QUERY_CACHE_SIZE = 512
+
 class CourseRecommenderPipeline:
     def __init__(self):
         self.data_loader = DataLoader()
@@ -23,14 +29,67 @@ class CourseRecommenderPipeline:
         # Build Global Vocabulary for Strict Checking
         # We concat all titles, skills, and descriptions into a single text blob lowercased
         self.global_corpus_text = ""
+        self.dataset_hash: Optional[str] = None
+        # request key -> response, most recently used last
+        self._query_cache: "OrderedDict[Tuple, RecommendResponse]" = OrderedDict()
+        self._query_cache_lock = threading.Lock()
         if self.courses_df is not None:
+            if settings.CLEAN_DATA_PARQUET.exists():
+                self.dataset_hash = get_dataset_hash_from_path(str(settings.CLEAN_DATA_PARQUET))
+            # *_lower columns are added by DataLoader
             self.global_corpus_text = " ".join(
-                self.courses_df['title'].fillna('').astype(str).tolist() + 
-                self.courses_df['skills'].fillna('').astype(str).tolist() + 
-                self.courses_df['description'].fillna('').astype(str).tolist()
-            ).lower()
+                self.courses_df['title_lower'].tolist() + 
+                self.courses_df['skills_lower'].tolist() + 
+                self.courses_df['description_lower'].tolist()
+            )
+
+    def _cache_key(self, request: RecommendRequest) -> Tuple:
+        # Gating and scoring only see the normalized query and whether the
+        # original was Arabic, so requests differing in case/punctuation share an entry
+        filters = json.dumps(request.filters, sort_keys=True, default=str) if request.filters else None
+        return (
+            normalize_query(request.query),
+            is_arabic(request.query),
+            request.top_k,
+            filters,
+            request.enable_reranking,
+            request.count_only,
+            self.dataset_hash,
+        )
+
+    def clear_query_cache(self) -> None:
+        """Drop all cached responses (e.g. after the index is rebuilt)."""
+        with self._query_cache_lock:
+            self._query_cache.clear()
 
     def recommend(self, request: RecommendRequest) -> RecommendResponse:
+        """
+        Recommend courses for a request. Responses are cached in memory per
+        (normalized query, top_k, filters, flags, dataset hash), up to QUERY_CACHE_SIZE entries.
+        """
+        if self.index is None or self.courses_df is None:
+            return self._recommend_uncached(request)
+
+        key = self._cache_key(request)
+        with self._query_cache_lock:
+            cached = self._query_cache.get(key)
+            if cached is not None:
+                self._query_cache.move_to_end(key)
+        if cached is not None:
+            response = cached.model_copy(deep=True)
+            if "original_query" in response.debug_info:
+                response.debug_info["original_query"] = request.query
+            response.debug_info["cache_hit"] = True
+            return response
+
+        response = self._recommend_uncached(request)
+        with self._query_cache_lock:
+            self._query_cache[key] = response.model_copy(deep=True)
+            if len(self._query_cache) > QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+        return response
+
+    def _recommend_uncached(self, request: RecommendRequest) -> RecommendResponse:
         start_time = time.time()
         
         if self.index is None or self.courses_df is None:
@@ -154,8 +213,8 @@ class CourseRecommenderPipeline:
             valid_candidates = []
             dummy_score = 1.0 
             
-            for idx, row in self.courses_df.iterrows():
-                course = row.to_dict()
+            # to_dict('records') builds plain dicts in one pass instead of a Series per row
+            for course in self.courses_df.to_dict('records'):
                 is_valid, matched_kws = check_gating(
                     course=course,
                     score=dummy_score,
@@ -188,6 +247,19 @@ class CourseRecommenderPipeline:
             logger.info("Low results, attempting relaxed threshold...")
             valid_candidates = filter_candidates(SEMANTIC_THRESHOLD_RELAXED)
 
+        if request.count_only:
+            # Caller only needs the number of matches: skip reranking and result building
+            return RecommendResponse(
+                results=[],
+                total_found=len(valid_candidates),
+                debug_info={
+                    "time_taken": time.time() - start_time,
+                    "original_query": original_query,
+                    "normalized_query": norm_query,
+                    "count_only": True
+                }
+            )
+
         # 5. Reranking (Optional)
         if request.enable_reranking and len(valid_candidates) > 1:
             top_slice = valid_candidates[:20]
@@ -207,32 +279,33 @@ class CourseRecommenderPipeline:
         final_results = valid_candidates[:request.top_k]
         final_results = normalize_rank_1_10(final_results)
         
-        output_list = []
-        for res in final_results:
-            rec = Recommendation(
-                title=res['title'],
-                url=res['url'],
-                rank=res['rank'],
-                score=res['score'], 
-                category=res.get('category', 'General'),
-                level=res.get('level', 'Any'),
-                matched_keywords=res['matched_keywords'],
-                why=res['why'],
-                debug_info={
+        raw_results = [
+            {
+                "title": res['title'],
+                "url": res['url'],
+                "rank": res['rank'],
+                "score": res['score'],
+                "category": res.get('category', 'General'),
+                "level": res.get('level', 'Any'),
+                "matched_keywords": res['matched_keywords'],
+                "why": res['why'],
+                "debug_info": {
                     "desc_snippet": res['description'][:150]
                 }
-            )
-            output_list.append(rec)
+            }
+            for res in final_results
+        ]
 
         elapsed = time.time() - start_time
-        return RecommendResponse(
-            results=output_list,
-            total_found=len(output_list),
-            debug_info={
+        # Validate the whole response in one pass instead of one Recommendation at a time
+        return RecommendResponse.model_validate({
+            "results": raw_results,
+            "total_found": len(raw_results),
+            "debug_info": {
                 "time_taken": elapsed,
                 "original_query": original_query,
                 "normalized_query": norm_query,
                 "is_short_query": is_short_query,
                 "threshold_used": current_threshold
             }
-        )
+        })
@@ -1,5 +1,19 @@
+import numpy as np
 from typing import List, Dict, Any
 
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first.
+    Uses argpartition (O(N)) and only sorts the k selected entries.
+    """
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < len(scores):
+        idx = np.argpartition(scores, -k)[-k:]
+    else:
+        idx = np.arange(len(scores))
+    return idx[np.argsort(scores[idx], kind="stable")[::-1]]
+
 def normalize_rank_1_10(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Normalize similarity scores to 1-10 integer ranks.
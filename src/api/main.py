@@ -55,6 +55,11 @@ async def startup_event():
         logger.critical("Startup failed: Missing environment variables.")
         # In a real production environment, we might raise a SystemExit here
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    from src.report.pdf_renderer import close_browser
+    await close_browser()
+
 @app.get("/health", tags=["System"])
 def health_check():
     """Service health and uptime."""
@@ -155,10 +155,9 @@ async def get_catalog_weekly_report_html(top_n: int = 10, bottom_n: int = 10):
 async def get_catalog_weekly_report_pdf(top_n: int = 10, bottom_n: int = 10):
     """Returns the weekly catalog report as a professional PDF Dashboard."""
     try:
-        from src.report.pdf_renderer import render_catalog_weekly_html, html_to_pdf
+        from src.report.pdf_renderer import render_catalog_weekly_pdf
         report = build_catalog_weekly_report(top_n=top_n, bottom_n=bottom_n)
-        html_content = render_catalog_weekly_html(report)
-        pdf_bytes = await html_to_pdf(html_content)
+        pdf_bytes = await render_catalog_weekly_pdf(report)
         
         filename = f"Zedny_Weekly_Report_{datetime.now(timezone.utc).strftime('%Y%m%d')}.pdf"
         
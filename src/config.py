@@ -1,5 +1,6 @@
 import os
 from pathlib import Path
+from typing import Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 from pydantic import field_validator, Field, AliasChoices
@@ -14,10 +15,18 @@ class Settings(BaseSettings):
     CLEAN_DATA_PARQUET: Path = DATA_DIR / "courses_clean.parquet"
     FAISS_INDEX_PATH: Path = DATA_DIR / "faiss.index"
     EMBEDDINGS_PATH: Path = DATA_DIR / "course_embeddings.npy"
+    # CourseRecommender caches its course embedding matrices here
+    EMBEDDINGS_CACHE_DIR: Path = ROOT_DIR / "outputs"
 
     # Models
     EMBEDDING_MODEL_NAME: str = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
     RERANKER_MODEL_NAME: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    # "torch" (SentenceTransformer) or "onnx" (int8-quantized ONNX Runtime export).
+    # The two produce slightly different vectors, so each backend searches its
+    # own FAISS index (see faiss_index_file); rebuild it after switching.
+    EMBEDDING_BACKEND: str = "torch"
+    ONNX_MODEL_DIR: Path = DATA_DIR / "onnx"
+    EMBEDDING_BATCH_SIZE: int = 32
 
     # Validation & Thresholds
     MIN_QUERY_LENGTH: int = 2
@@ -47,7 +56,14 @@ class Settings(BaseSettings):
     COMPANY_REFERRER: str = Field("https://zedny.ai/", validation_alias=AliasChoices("COMPANY_REFERRER", "REFERRER"))
     COURSE_BASE_URL: str = Field("https://zedny.com/course", validation_alias=AliasChoices("COURSE_BASE_URL", "COURSE_URL"))
     REPORT_OUTPUT_DIR: Path = ROOT_DIR / "outputs"
+    REPORT_CACHE_TTL_SECONDS: int = 900
+    # Compiled Jinja bytecode survives worker restarts. Unset uses Jinja's
+    # per-user 0700 temp directory; a custom directory must be owned by the
+    # service user and not group/world-writable. Empty string disables it.
+    ZEDNY_JINJA_CACHE_DIR: Optional[str] = None
     HEADLESS: bool = True
+    # Number of isolated browser contexts rendering PDFs in parallel
+    PDF_RENDER_CONCURRENCY: int = max(1, (os.cpu_count() or 2) // 2)
     REQUEST_TIMEOUT: int = 30
     USER_AGENT: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 
@@ -58,6 +74,13 @@ class Settings(BaseSettings):
             raise ValueError("ZEDNY_AUTH_TOKEN is missing! Please provide it in .env")
         return v.strip()
 
+    @property
+    def faiss_index_file(self) -> Path:
+        """FAISS index built from the active embedding backend's vectors."""
+        if self.EMBEDDING_BACKEND == "onnx":
+            return self.FAISS_INDEX_PATH.with_name(f"{self.FAISS_INDEX_PATH.stem}_onnx{self.FAISS_INDEX_PATH.suffix}")
+        return self.FAISS_INDEX_PATH
+
     def check_env(self):
         """Perform startup checks to ensure critical environment variables are set."""
         critical_vars = ["ZEDNY_BASE_URL", "ZEDNY_AUTH_TOKEN", "COMPANY_BASE_URL"]
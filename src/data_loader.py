@@ -12,6 +12,15 @@ from src.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+def add_lowercase_columns(courses_df):
+    """
+    Add title_lower / skills_lower / description_lower to a freshly loaded
+    DataFrame, so gating doesn't lowercase every candidate on every query.
+    """
+    for col in ('title', 'skills', 'description'):
+        courses_df[f'{col}_lower'] = courses_df[col].fillna('').astype(str).str.lower()
+    return courses_df
+
 class DataLoader:
     _instance = None
     _index = None
@@ -33,18 +42,19 @@ class DataLoader:
             
         try:
             logger.info("Loading FAISS index...")
-            if not settings.FAISS_INDEX_PATH.exists():
-                logger.error(f"FAISS index not found at {settings.FAISS_INDEX_PATH}")
+            index_path = settings.faiss_index_file
+            if not index_path.exists():
+                logger.error(f"FAISS index not found at {index_path} (build it with scripts/build_index.py)")
                 return None, None
                 
-            self._index = faiss.read_index(str(settings.FAISS_INDEX_PATH))
+            self._index = faiss.read_index(str(index_path))
             
             logger.info("Loading Courses Parquet...")
             if not settings.CLEAN_DATA_PARQUET.exists():
                 logger.error(f"Data not found at {settings.CLEAN_DATA_PARQUET}")
                 return None, None
                 
-            self._courses_df = pd.read_parquet(settings.CLEAN_DATA_PARQUET)
+            self._courses_df = add_lowercase_columns(pd.read_parquet(settings.CLEAN_DATA_PARQUET))
             
             logger.info("Data loaded successfully.")
             return self._index, self._courses_df
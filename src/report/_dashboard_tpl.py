@@ -0,0 +1,68 @@
+# Generated by scripts/compile_templates.py -- do not edit.
+SOURCE_HASH = '8019637f5f07fe881d9e092b3e2283f55bfb16e88e4ae03dfbb162824e25f3a1'
+from jinja2.runtime import LoopContext, Macro, Markup, Namespace, TemplateNotFound, TemplateReference, TemplateRuntimeError, Undefined, escape, identity, internalcode, markup_join, missing, str_join
+name = 'dashboard.html'
+
+def root(context, missing=missing):
+    resolve = context.resolve_or_missing
+    undefined = environment.undefined
+    concat = environment.concat
+    cond_expr_undefined = Undefined
+    if 0: yield None
+    l_0_generated_at = resolve('generated_at')
+    l_0_kpis = resolve('kpis')
+    l_0_category_chart_svg = resolve('category_chart_svg')
+    l_0_level_chart_svg = resolve('level_chart_svg')
+    l_0_top_categories = resolve('top_categories')
+    l_0_insights = resolve('insights')
+    try:
+        t_1 = environment.filters['length']
+    except KeyError:
+        @internalcode
+        def t_1(*unused):
+            raise TemplateRuntimeError("No filter named 'length' found.")
+    try:
+        t_2 = environment.filters['round']
+    except KeyError:
+        @internalcode
+        def t_2(*unused):
+            raise TemplateRuntimeError("No filter named 'round' found.")
+    pass
+    yield '\n<!DOCTYPE html>\n<html lang="en">\n<head>\n    <meta charset="UTF-8">\n    <title>Weekly Catalogue Intelligence Report</title>\n    <style>\n        \nbody {\n    font-family: \'Segoe UI\', Tahoma, Geneva, Verdana, sans-serif;\n    color: #333;\n    line-height: 1.6;\n    margin: 0;\n    padding: 40px;\n    background-color: #f4f7f6;\n}\n.report-container {\n    max-width: 1000px;\n    margin: 0 auto;\n    background: white;\n    padding: 40px;\n    box-shadow: 0 4px 6px rgba(0,0,0,0.1);\n    border-radius: 8px;\n}\n.header {\n    border-bottom: 2px solid #0056b3;\n    margin-bottom: 30px;\n    padding-bottom: 10px;\n}\n.header h1 {\n    margin: 0;\n    color: #0056b3;\n    font-size: 28px;\n}\n.header .date {\n    font-size: 14px;\n    color: #666;\n}\n.kpi-container {\n    display: flex;\n    justify-content: space-between;\n    margin-bottom: 40px;\n    gap: 20px;\n}\n.kpi-card {\n    flex: 1;\n    background: #f8f9fa;\n    padding: 20px;\n    border-radius: 8px;\n    text-align: center;\n    border: 1px solid #e9ecef;\n}\n.kpi-card h3 {\n    margin: 0;\n    font-size: 14px;\n    color: #666;\n    text-transform: uppercase;\n}\n.kpi-card .value {\n    font-size: 32px;\n    font-weight: bold;\n    color: #0056b3;\n    margin: 10px 0 0;\n}\n.section {\n    margin-bottom: 40px;\n}\n.section h2 {\n    font-size: 20px;\n    color: #333;\n    border-left: 4px solid #0056b3;\n    padding-left: 10px;\n    margin-bottom: 20px;\n}\ntable {\n    width: 100%;\n    border-collapse: collapse;\n}\nth, td {\n    text-align: left;\n    padding: 12px;\n    border-bottom: 1px solid #eee;\n}\nth {\n    background: #f8f9fa;\n    color: #666;\n    font-weight: 600;\n}\n.chart-grid {\n    display: flex;\n    gap: 30px;\n    margin-bottom: 40px;\n}\n.chart-item {\n    flex: 1;\n}\n.chart-container {\n    background: #fff;\n    padding: 20px;\n    text-align: center;\n}\n.footer {\n    text-align: center;\n    font-size: 12px;\n    color: #999;\n    margin-top: 50px;\n    border-top: 1px solid #eee;\n    padding-top: 20px;\n}\n\n    </style>\n</head>\n<body>\n    <div class="report-container">\n        <div class="header">\n            <h1>Weekly Catalogue Intelligence Report</h1>\n            <div class="date">Generated on: '
+    yield str((undefined(name='generated_at') if l_0_generated_at is missing else l_0_generated_at))
+    yield '</div>\n        </div>\n\n        <div class="kpi-container">\n            <div class="kpi-card">\n                <h3>Total Courses</h3>\n                <div class="value">'
+    yield str(environment.getattr((undefined(name='kpis') if l_0_kpis is missing else l_0_kpis), 'total_courses'))
+    yield '</div>\n            </div>\n            <div class="kpi-card">\n                <h3>Unique Categories</h3>\n                <div class="value">'
+    yield str(environment.getattr((undefined(name='kpis') if l_0_kpis is missing else l_0_kpis), 'total_categories'))
+    yield '</div>\n            </div>\n            <div class="kpi-card">\n                <h3>Active Instructors</h3>\n                <div class="value">'
+    yield str(environment.getattr((undefined(name='kpis') if l_0_kpis is missing else l_0_kpis), 'total_instructors'))
+    yield '</div>\n            </div>\n        </div>\n\n        <div class="chart-grid">\n            <div class="chart-item">\n                <div class="section">\n                    <h2>Category Distribution</h2>\n                    <div class="chart-container">\n                        '
+    yield str((undefined(name='category_chart_svg') if l_0_category_chart_svg is missing else l_0_category_chart_svg))
+    yield '\n                    </div>\n                </div>\n            </div>\n            <div class="chart-item">\n                <div class="section">\n                    <h2>Level Distribution</h2>\n                    <div class="chart-container">\n                        '
+    yield str((undefined(name='level_chart_svg') if l_0_level_chart_svg is missing else l_0_level_chart_svg))
+    yield '\n                    </div>\n                </div>\n            </div>\n        </div>\n\n        <div class="section">\n            <h2>Top '
+    yield str(t_1((undefined(name='top_categories') if l_0_top_categories is missing else l_0_top_categories)))
+    yield ' Categories</h2>\n            <table>\n                <thead>\n                    <tr>\n                        <th>Category Name</th>\n                        <th>Course Count</th>\n                        <th>Share</th>\n                    </tr>\n                </thead>\n                <tbody>\n'
+    for l_1_cat in (undefined(name='top_categories') if l_0_top_categories is missing else l_0_top_categories):
+        _loop_vars = {}
+        pass
+        yield '                    <tr>\n                        <td>'
+        yield str(environment.getattr(l_1_cat, 'name'))
+        yield '</td>\n                        <td>'
+        yield str(environment.getattr(l_1_cat, 'course_count'))
+        yield '</td>\n                        <td>'
+        yield str(t_2((environment.getattr(l_1_cat, 'share') * 100), 1))
+        yield '%</td>\n                    </tr>\n'
+    l_1_cat = missing
+    yield '                </tbody>\n            </table>\n        </div>\n\n        <div class="section">\n            <h2>Insights</h2>\n            <ul>\n'
+    for l_1_insight in (undefined(name='insights') if l_0_insights is missing else l_0_insights):
+        _loop_vars = {}
+        pass
+        yield '                <li>'
+        yield str(l_1_insight)
+        yield '</li>\n'
+    l_1_insight = missing
+    yield '            </ul>\n        </div>\n\n        <div class="footer">\n            Generated automatically by n8n + Zedny Report API\n        </div>\n    </div>\n</body>\n</html>'
+
+blocks = {}
+debug_info = '117=30&123=32&127=34&131=36&140=38&148=40&155=42&165=44&167=48&168=50&169=52&179=56&180=60'
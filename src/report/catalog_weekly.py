@@ -1,14 +1,46 @@
+import copy
 import logging
+import threading
+import time
 from datetime import datetime, timezone
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
+
+import pandas as pd
+from src.config import settings
 from src.scraper.client import ZednyClient, ZednyClientError
 
 logger = logging.getLogger(__name__)
 
+# (top_n, bottom_n) -> (built_at, report)
+_REPORT_CACHE: Dict[Tuple[int, int], Tuple[float, Dict[str, Any]]] = {}
+_REPORT_CACHE_LOCK = threading.Lock()
+
 def build_catalog_weekly_report(top_n: int = 10, bottom_n: int = 10) -> Dict[str, Any]:
     """
     Builds a professional Weekly Catalogue Intelligence Report.
+    Results are cached per (top_n, bottom_n) for REPORT_CACHE_TTL_SECONDS.
     """
+    key = (top_n, bottom_n)
+    ttl = settings.REPORT_CACHE_TTL_SECONDS
+
+    with _REPORT_CACHE_LOCK:
+        cached = _REPORT_CACHE.get(key)
+    if cached is not None and time.monotonic() - cached[0] < ttl:
+        logger.info(f"Serving cached catalog weekly report for top_n={top_n}, bottom_n={bottom_n}")
+        return copy.deepcopy(cached[1])
+
+    report = _build_catalog_weekly_report(top_n, bottom_n)
+    if ttl > 0:
+        with _REPORT_CACHE_LOCK:
+            _REPORT_CACHE[key] = (time.monotonic(), report)
+    return copy.deepcopy(report)
+
+def clear_report_cache() -> None:
+    """Drop all cached reports (e.g. after a catalogue update)."""
+    with _REPORT_CACHE_LOCK:
+        _REPORT_CACHE.clear()
+
+def _build_catalog_weekly_report(top_n: int, bottom_n: int) -> Dict[str, Any]:
     logger.info(f"Starting build_catalog_weekly_report(top_n={top_n}, bottom_n={bottom_n})")
     client = ZednyClient()
     
@@ -23,34 +55,14 @@ def build_catalog_weekly_report(top_n: int = 10, bottom_n: int = 10) -> Dict[str
         return _empty_report()
 
     # Data transformation & aggregation
-    categories_map = {}
-    instructors_map = {}
+    df = pd.DataFrame.from_records(courses, columns=["level", "categories", "instructors"])
+
     levels_map = {"Beginner": 0, "Intermediate": 0, "Advanced": 0, "Unknown": 0}
+    levels = df["level"].where(df["level"].isin(list(levels_map)), "Unknown")
+    levels_map.update({lvl: int(n) for lvl, n in levels.value_counts().items()})
 
-    for course in courses:
-        # Levels
-        lvl = course.get("level", "Unknown")
-        if lvl not in levels_map:
-            lvl = "Unknown"
-        levels_map[lvl] += 1
-
-        # Categories
-        for cat in course.get("categories", []) or []:
-            if not cat: continue  # Guard against None in list
-            cat_id = cat.get("id")
-            if cat_id:
-                if cat_id not in categories_map:
-                    categories_map[cat_id] = {"name": cat.get("name", "Unknown"), "count": 0}
-                categories_map[cat_id]["count"] += 1
-
-        # Instructors
-        for inst in course.get("instructors", []) or []:
-            if not inst: continue  # Guard against None in list
-            inst_id = inst.get("id")
-            if inst_id:
-                if inst_id not in instructors_map:
-                    instructors_map[inst_id] = {"name": inst.get("name", "Unknown"), "count": 0}
-                instructors_map[inst_id]["count"] += 1
+    categories_map = _count_entities(df["categories"])
+    instructors_map = _count_entities(df["instructors"])
 
     # Format Results
     # Levels distribution
@@ -130,6 +142,31 @@ def build_catalog_weekly_report(top_n: int = 10, bottom_n: int = 10) -> Dict[str
 
     return report
 
+def _count_entities(column: pd.Series) -> Dict[Any, Dict[str, Any]]:
+    """
+    Count occurrences of {id, name} entries in a column of lists.
+    Returns {id: {"name": ..., "count": ...}} in first-seen order; the name
+    comes from the first entry seen for each id ("Unknown" only if that
+    entry has no "name" key, an explicit None is kept).
+    """
+    entries = column.explode().dropna()
+    entries = entries[entries.map(lambda e: isinstance(e, dict) and bool(e))]
+    if entries.empty:
+        return {}
+
+    # Plain lists keep None as None (Series.map would turn it into NaN)
+    records = [(e.get("id"), e.get("name", "Unknown")) for e in entries if e.get("id")]
+    if not records:
+        return {}
+    ents = pd.DataFrame(records, columns=["id", "name"], dtype=object)
+
+    sizes = ents.groupby("id", sort=False).size()
+    first = ents.drop_duplicates("id")
+    return {
+        k: {"name": name, "count": int(sizes[k])}
+        for k, name in zip(first["id"], first["name"])
+    }
+
 def _generate_markdown(total, cats, insts, top_cats, bottom_cats, levels) -> str:
     md = f"""# Weekly Catalogue Intelligence Report
 Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
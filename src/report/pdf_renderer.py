@@ -1,10 +1,18 @@
 import asyncio
-from jinja2 import Environment, FileSystemLoader, Template
+import hashlib
+import math
+import os
+import stat
+import tempfile
+from contextlib import asynccontextmanager
+import jinja2
+from jinja2 import Environment, DictLoader, FileSystemBytecodeCache, FileSystemLoader, Template
 from playwright.async_api import async_playwright
 import logging
 from datetime import datetime
 from typing import Dict, Any
 from pathlib import Path
+from src.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -203,6 +211,80 @@ HTML_TEMPLATE = """
 </html>
 """
 
+TEMPLATE_NAME = "dashboard.html"
+
+# The CSS is static, so it is spliced into the source instead of being
+# passed through the renderer on every call.
+TEMPLATE_SOURCE = HTML_TEMPLATE.replace("{{ css }}", DASHBOARD_CSS)
+
+# Ties the precompiled module to this exact source and Jinja version
+TEMPLATE_SOURCE_HASH = hashlib.sha256(
+    f"{jinja2.__version__}\n{TEMPLATE_SOURCE}".encode("utf-8")
+).hexdigest()
+
+def _is_private_dir(path: str) -> bool:
+    """True if path is a real directory owned by us that nobody else can write to."""
+    st = os.lstat(path)
+    return (
+        stat.S_ISDIR(st.st_mode)
+        and st.st_uid == os.getuid()
+        and not st.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+    )
+
+def _build_environment() -> Environment:
+    """
+    Jinja environment with an on-disk bytecode cache (if enabled). Cached
+    bytecode is unmarshalled and executed, so the directory has to be private.
+    """
+    bytecode_cache = None
+    cache_dir = settings.ZEDNY_JINJA_CACHE_DIR
+    try:
+        if cache_dir is None:
+            # Jinja creates and verifies a per-user 0700 directory itself
+            bytecode_cache = FileSystemBytecodeCache()
+        elif cache_dir:
+            os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+            if _is_private_dir(cache_dir):
+                bytecode_cache = FileSystemBytecodeCache(directory=cache_dir)
+            else:
+                logger.warning(
+                    f"Jinja bytecode cache disabled: {cache_dir} is not a directory "
+                    "owned by this user with mode 0700"
+                )
+    except (OSError, RuntimeError) as e:
+        logger.warning(f"Jinja bytecode cache disabled ({cache_dir}): {e}")
+
+    loader = DictLoader({TEMPLATE_NAME: TEMPLATE_SOURCE})
+    return Environment(
+        loader=loader,
+        bytecode_cache=bytecode_cache,
+        autoescape=False,
+        trim_blocks=True,
+        lstrip_blocks=True
+    )
+
+def _load_template(env: Environment) -> Template:
+    """
+    Use the precompiled module from scripts/compile_templates.py when it
+    matches the current source; otherwise compile through the environment.
+    """
+    try:
+        from src.report import _dashboard_tpl
+    except ImportError:
+        _dashboard_tpl = None
+
+    if _dashboard_tpl is not None and getattr(_dashboard_tpl, "SOURCE_HASH", None) == TEMPLATE_SOURCE_HASH:
+        return env.template_class.from_module_dict(env, vars(_dashboard_tpl), env.make_globals(None))
+
+    if _dashboard_tpl is not None:
+        logger.warning("Precompiled dashboard template is stale; run scripts/compile_templates.py")
+    return env.get_template(TEMPLATE_NAME)
+
+# Compiled once per process; the precompiled module (or bytecode cache)
+# skips parsing across restarts
+_ENV = _build_environment()
+_TEMPLATE = _load_template(_ENV)
+
 def generate_bar_chart_svg(labels, values, title=""):
     """Generates an inline SVG bar chart."""
     if not values: return ""
@@ -212,19 +294,20 @@ def generate_bar_chart_svg(labels, values, title=""):
     bar_width = 30
     gap = 15
     chart_h = height - 50
-    svg = f'<svg width="{width}" height="{height}" viewBox="0 0 {width} {height}" xmlns="http://www.w3.org/2000/svg">'
+    # Collect fragments and join once instead of growing a string
+    parts = [f'<svg width="{width}" height="{height}" viewBox="0 0 {width} {height}" xmlns="http://www.w3.org/2000/svg">']
     for i, (label, val) in enumerate(zip(labels, values)):
         bh = (val / max_val) * chart_h if max_val > 0 else 0
         x = 50 + i * (bar_width + gap)
         y = chart_h - bh + 20
-        svg += f'<rect x="{x}" y="{y}" width="{bar_width}" height="{bh}" fill="#0056b3" />'
+        parts.append(f'<rect x="{x}" y="{y}" width="{bar_width}" height="{bh}" fill="#0056b3" />')
         # Label (truncated)
         short_label = label[:6] + ".." if len(label) > 8 else label
-        svg += f'<text x="{x + bar_width/2}" y="{chart_h + 35}" font-size="10" text-anchor="middle" fill="#666">{short_label}</text>'
+        parts.append(f'<text x="{x + bar_width/2}" y="{chart_h + 35}" font-size="10" text-anchor="middle" fill="#666">{short_label}</text>')
         # Value
-        svg += f'<text x="{x + bar_width/2}" y="{y - 5}" font-size="10" text-anchor="middle" font-weight="bold" fill="#333">{val}</text>'
-    svg += '</svg>'
-    return svg
+        parts.append(f'<text x="{x + bar_width/2}" y="{y - 5}" font-size="10" text-anchor="middle" font-weight="bold" fill="#333">{val}</text>')
+    parts.append('</svg>')
+    return "".join(parts)
 
 def generate_donut_chart_svg(labels, values):
     """Generates an inline SVG donut chart."""
@@ -236,16 +319,15 @@ def generate_donut_chart_svg(labels, values):
     radius = 80
     inner_radius = 50
     
-    import math
-    
-    svg = f'<svg width="{width}" height="{height}" viewBox="0 0 {width} {height}" xmlns="http://www.w3.org/2000/svg">'
-    current_angle = 0
+    parts = [f'<svg width="{width}" height="{height}" viewBox="0 0 {width} {height}" xmlns="http://www.w3.org/2000/svg">']
     colors = ["#0056b3", "#28a745", "#ffc107", "#dc3545", "#17a2b8"]
     
+    current_angle = 0
     for i, (label, val) in enumerate(zip(labels, values)):
         if total == 0: continue
         percent = val / total
         slice_angle = percent * 2 * math.pi
+        color = colors[i % len(colors)]
         
         # Draw path
         x1 = center + radius * math.cos(current_angle)
@@ -255,25 +337,22 @@ def generate_donut_chart_svg(labels, values):
         
         large_arc = 1 if slice_angle > math.pi else 0
         
-        svg += f'<path d="M {x1} {y1} A {radius} {radius} 0 {large_arc} 1 {x2} {y2}" fill="none" stroke="{colors[i % len(colors)]}" stroke-width="{radius-inner_radius}" />'
+        parts.append(f'<path d="M {x1} {y1} A {radius} {radius} 0 {large_arc} 1 {x2} {y2}" fill="none" stroke="{color}" stroke-width="{radius-inner_radius}" />')
         
         # Legend (simplified)
         lx = 10
         ly = 20 + i * 15
-        svg += f'<rect x="{lx}" y="{ly}" width="10" height="10" fill="{colors[i % len(colors)]}" />'
-        svg += f'<text x="{lx + 15}" y="{ly + 9}" font-size="9" fill="#666">{label} ({int(percent*100)}%)</text>'
+        parts.append(f'<rect x="{lx}" y="{ly}" width="10" height="10" fill="{color}" />')
+        parts.append(f'<text x="{lx + 15}" y="{ly + 9}" font-size="9" fill="#666">{label} ({int(percent*100)}%)</text>')
         
         current_angle += slice_angle
         
-    svg += f'<circle cx="{center}" cy="{center}" r="{inner_radius}" fill="white" />'
-    svg += '</svg>'
-    return svg
+    parts.append(f'<circle cx="{center}" cy="{center}" r="{inner_radius}" fill="white" />')
+    parts.append('</svg>')
+    return "".join(parts)
 
-def render_catalog_weekly_html(report: dict) -> str:
-    """Renders the executive HTML dashboard."""
-    env = Environment()
-    template = env.from_string(HTML_TEMPLATE)
-    
+def _template_context(report: dict) -> dict:
+    """Builds the dashboard template variables from a report dict."""
     # Prepare chart data
     chart_data = report.get("chart_data", {})
     cat_labels = chart_data.get("categories_labels", [])[:8]
@@ -293,8 +372,7 @@ def render_catalog_weekly_html(report: dict) -> str:
     except:
         gen_at_readable = gen_at
         
-    html_out = template.render(
-        css=DASHBOARD_CSS,
+    return dict(
         generated_at=gen_at_readable,
         kpis=report.get("kpis", {}),
         top_categories=report.get("top_categories", []),
@@ -302,23 +380,165 @@ def render_catalog_weekly_html(report: dict) -> str:
         category_chart_svg=cat_svg,
         level_chart_svg=lvl_svg
     )
-    return html_out
+
+def render_catalog_weekly_html(report: dict) -> str:
+    """Renders the executive HTML dashboard."""
+    return _TEMPLATE.render(**_template_context(report))
+
+def _stream_to_tempfile(report: dict) -> str:
+    """Streams the rendered dashboard into a temp .html file and returns its path."""
+    stream = _TEMPLATE.stream(**_template_context(report))
+    stream.enable_buffering(size=16)
+    with tempfile.NamedTemporaryFile("w", suffix=".html", encoding="utf-8", delete=False) as f:
+        stream.dump(f)
+    return f.name
+
+# Chromium is launched once per process and reused across PDF renders
+_PLAYWRIGHT = None
+_BROWSER = None
+_BROWSER_LOCK = asyncio.Lock()
+
+async def _get_browser():
+    """Lazily start Playwright and a headless Chromium shared by all renders."""
+    global _PLAYWRIGHT, _BROWSER
+    if _BROWSER is not None and _BROWSER.is_connected():
+        return _BROWSER
+
+    async with _BROWSER_LOCK:
+        if _BROWSER is None or not _BROWSER.is_connected():
+            if _PLAYWRIGHT is None:
+                _PLAYWRIGHT = await async_playwright().start()
+            logger.info("Launching headless Chromium for PDF rendering...")
+            _BROWSER = await _PLAYWRIGHT.chromium.launch(headless=True)
+    return _BROWSER
+
+class _ContextPool:
+    """
+    Bounded pool of BrowserContexts so several PDFs render in parallel.
+    Contexts are created on demand up to `size`; further callers wait for a
+    free one, which also backpressures incoming report requests.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        # One permit per slot: held from acquire() until release()/discard(),
+        # so a freed slot always wakes a waiter
+        self._slots = asyncio.Semaphore(size)
+        self._idle = []
+        self._contexts = []
+
+    async def acquire(self):
+        await self._slots.acquire()
+        try:
+            while self._idle:
+                ctx = self._idle.pop()
+                if ctx.browser is not None and ctx.browser.is_connected():
+                    return ctx
+                # Browser was relaunched; drop the stale context
+                self._forget(ctx)
+
+            browser = await _get_browser()
+            ctx = await browser.new_context()
+            self._contexts.append(ctx)
+            return ctx
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, ctx) -> None:
+        self._idle.append(ctx)
+        self._slots.release()
+
+    async def discard(self, ctx) -> None:
+        """Close a broken context and free its slot instead of returning it."""
+        self._forget(ctx)
+        self._slots.release()
+        try:
+            await ctx.close()
+        except Exception as e:
+            logger.warning(f"Failed to close browser context: {e}")
+
+    def _forget(self, ctx) -> None:
+        # close() may already have dropped it
+        if ctx in self._contexts:
+            self._contexts.remove(ctx)
+
+    async def close(self) -> None:
+        for ctx in self._contexts:
+            try:
+                await ctx.close()
+            except Exception as e:
+                logger.warning(f"Failed to close browser context: {e}")
+        self._contexts = []
+        self._idle = []
+
+_CONTEXT_POOL = _ContextPool(settings.PDF_RENDER_CONCURRENCY)
+
+async def close_browser() -> None:
+    """Shut down the shared browser (called on application shutdown)."""
+    global _PLAYWRIGHT, _BROWSER
+    await _CONTEXT_POOL.close()
+    async with _BROWSER_LOCK:
+        if _BROWSER is not None:
+            await _BROWSER.close()
+            _BROWSER = None
+        if _PLAYWRIGHT is not None:
+            await _PLAYWRIGHT.stop()
+            _PLAYWRIGHT = None
+
+@asynccontextmanager
+async def _pooled_page():
+    """
+    Yields a fresh page on a pooled context. The context goes back to the pool
+    afterwards, unless opening or closing the page failed, in which case it is
+    discarded so a crashed browser can't leak pool slots.
+    """
+    ctx = await _CONTEXT_POOL.acquire()
+    page = None
+    healthy = False
+    try:
+        page = await ctx.new_page()
+        yield page
+    finally:
+        if page is not None:
+            try:
+                await page.close()
+                healthy = True
+            except Exception as e:
+                logger.warning(f"Failed to close page: {e}")
+        if healthy:
+            _CONTEXT_POOL.release(ctx)
+        else:
+            await _CONTEXT_POOL.discard(ctx)
+
+async def _page_to_pdf(page) -> bytes:
+    # Lay the page out for print up front so page.pdf() doesn't relayout
+    await page.emulate_media(media="print")
+    return await page.pdf(
+        format="A4",
+        print_background=True,
+        margin={"top": "20px", "bottom": "20px", "left": "20px", "right": "20px"}
+    )
 
 async def html_to_pdf(html: str) -> bytes:
     """Converts HTML string to PDF bytes using Playwright."""
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-        context = await browser.new_context()
-        page = await context.new_page()
-        
-        # Set content directly
-        await page.set_content(html, wait_until="networkidle")
+    async with _pooled_page() as page:
+        # Everything is inline (CSS, SVG charts, system fonts), so the DOM
+        # being parsed is enough; there are no subresources to wait for
+        await page.set_content(html, wait_until="domcontentloaded")
         
         # Generate PDF
-        pdf_bytes = await page.pdf(
-            format="A4",
-            print_background=True,
-            margin={"top": "20px", "bottom": "20px", "left": "20px", "right": "20px"}
-        )
-        await browser.close()
-        return pdf_bytes
+        return await _page_to_pdf(page)
+
+async def render_catalog_weekly_pdf(report: dict) -> bytes:
+    """
+    Renders the dashboard straight to PDF. The template is streamed to a temp
+    file that Chromium loads, so the full HTML string is never built in memory.
+    """
+    path = await asyncio.to_thread(_stream_to_tempfile, report)
+    try:
+        async with _pooled_page() as page:
+            await page.goto(Path(path).as_uri(), wait_until="domcontentloaded")
+            return await _page_to_pdf(page)
+    finally:
+        os.unlink(path)
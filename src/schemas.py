@@ -17,6 +17,7 @@ class RecommendRequest(BaseModel):
     top_k: int = Field(30, ge=1, le=100)
     filters: Optional[Dict[str, Any]] = None
     enable_reranking: bool = False
+    count_only: bool = Field(False, description="Return only total_found (all gated matches, not capped by top_k)")
 
     @validator('query')
     def query_must_not_be_empty(cls, v):
@@ -1,11 +1,23 @@
+import json
+import math
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from src.config import settings
 from src.logger import setup_logger
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 logger = setup_logger(__name__)
 
+# Pages fetched concurrently once the first page has reported the total
+PAGINATION_WORKERS = 8
+
 class ZednyClientError(Exception):
     def __init__(self, message: str, status_code: int = None, endpoint: str = None, response_body: str = None):
         super().__init__(message)
@@ -30,7 +42,8 @@ class ZednyClient:
             status_forcelist=[429, 500, 502, 503, 504],
             allowed_methods=["GET", "POST"]
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # Pool sized above PAGINATION_WORKERS so concurrent page fetches reuse connections
+        adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=retry_strategy)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
         
@@ -40,6 +53,7 @@ class ZednyClient:
             "Authorization": auth_header,
             "Accept": "application/json",
             "Content-Type": "application/json",
+            "Connection": "keep-alive",
             "Accept-Language": "en",
             "x-language": settings.ZEDNY_LANG,
             "DNT": "1",
@@ -60,7 +74,8 @@ class ZednyClient:
                                        status_code=401, endpoint=endpoint, response_body=response.text)
             
             response.raise_for_status()
-            return response.json()
+            # Parse the raw bytes directly; skips requests' charset detection
+            return _json_loads(response.content)
             
         except ZednyClientError:
             raise
@@ -87,30 +102,43 @@ class ZednyClient:
         return self._get("courses/all", params={"page": page, "limit": limit})
 
     def get_all_courses(self, limit: int = 50, max_pages: int = 50) -> list[dict]:
-        """Fetch all courses by looping through pages."""
-        all_courses = []
-        page = 1
-        total = 0
-        
+        """Fetch all courses; pages after the first are fetched concurrently."""
         logger.info(f"Starting to fetch all courses (limit={limit}, max_pages={max_pages})")
         
-        while page <= max_pages:
-            try:
-                data = self.get_courses(page=page, limit=limit)
-                results = data.get("results", []) or data.get("products", [])
-                total = data.get("total", 0)
-                
-                if not results:
-                    break
-                    
-                all_courses.extend(results)
-                if len(all_courses) >= total or not total:
-                    break
-                    
-                page += 1
-            except Exception as e:
-                logger.error(f"Pagination failed at page {page}: {str(e)}")
-                raise
+        if max_pages < 1:
+            return []
+
+        try:
+            data = self.get_courses(page=1, limit=limit)
+        except Exception as e:
+            logger.error(f"Pagination failed at page 1: {str(e)}")
+            raise
+
+        all_courses = list(data.get("results", []) or data.get("products", []))
+        total = data.get("total", 0)
+
+        if all_courses and total and len(all_courses) < total:
+            pages = range(2, min(max_pages, math.ceil(total / limit)) + 1)
+            if pages:
+                pool = ThreadPoolExecutor(max_workers=min(PAGINATION_WORKERS, len(pages)))
+                try:
+                    futures = [pool.submit(self.get_courses, page=p, limit=limit) for p in pages]
+                    for page, future in zip(pages, futures):
+                        try:
+                            data = future.result()
+                        except Exception as e:
+                            logger.error(f"Pagination failed at page {page}: {str(e)}")
+                            raise
+
+                        results = data.get("results", []) or data.get("products", [])
+                        if not results:
+                            break
+                        all_courses.extend(results)
+                        if len(all_courses) >= total:
+                            break
+                finally:
+                    # Don't block on in-flight pages after an early break or error
+                    pool.shutdown(wait=False, cancel_futures=True)
                 
         logger.info(f"Successfully fetched {len(all_courses)} courses total.")
         return all_courses
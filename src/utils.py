@@ -2,20 +2,43 @@
 Utility functions for the course recommender system.
 """
 
+import hashlib
 import json
 import os
 import re
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Dict, Any
 
+import numpy as np
 import pandas as pd
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    import pyarrow  # noqa: F401
+    # Multithreaded CSV parser. Only the _COURSE_DTYPES columns are pinned:
+    # other columns may come back with different dtypes than under the C
+    # engine (pyarrow infers timestamps and uses its own set of NA tokens)
+    _CSV_ENGINE = "pyarrow"
+except ImportError:
+    _CSV_ENGINE = "c"
+
 
 # --------------------------
 # Text / Query Utilities
 # --------------------------
 
 _ARABIC_RE = re.compile(r"[\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF]")
+_PUNCT_RE = re.compile(r"[^\w\u0600-\u06FF]+", re.UNICODE)
 
 
 def is_arabic(text: str) -> bool:
@@ -25,6 +48,9 @@ def is_arabic(text: str) -> bool:
     """
     if not isinstance(text, str) or not text.strip():
         return False
+    # Most queries are plain ASCII; str.isascii() is O(1) on CPython
+    if text.isascii():
+        return False
     return bool(_ARABIC_RE.search(text))
 
 
@@ -39,15 +65,9 @@ def normalize_query(text: str) -> str:
     if not isinstance(text, str):
         return ""
 
-    text = text.strip().lower()
-
-    # Replace punctuation with space (keep Arabic & English & numbers)
-    text = re.sub(r"[^\w\u0600-\u06FF]+", " ", text, flags=re.UNICODE)
-
-    # Collapse whitespace
-    text = re.sub(r"\s+", " ", text).strip()
-
-    return text
+    # One pass: every run of punctuation and/or whitespace becomes a single
+    # space (whitespace is never \w), so no separate collapse step is needed
+    return _PUNCT_RE.sub(" ", text.lower()).strip()
 
 
 # --------------------------
@@ -58,50 +78,79 @@ def save_recommendations(
     user_query: str,
     filters: Dict[str, Any],
     recommendations: List[Dict[str, Any]],
-    output_path: str = "outputs/recommendations.json",
+    output_path: str = "outputs/recommendations.jsonl",
 ) -> None:
     """
-    Save recommendation results to JSON file.
+    Append recommendation results to a JSON Lines file (one record per line).
     """
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
     result = {
-        "timestamp": datetime.now().isoformat(),
+        # orjson serialises the datetime natively, in the same ISO format
+        "timestamp": datetime.now(),
         "user_query": user_query,
         "filters": filters,
         "recommended_courses": recommendations,
     }
 
-    # Load existing data if file exists
-    if os.path.exists(output_path):
-        with open(output_path, "r", encoding="utf-8") as f:
-            try:
-                data = json.load(f)
-                if not isinstance(data, list):
-                    data = [data]
-            except json.JSONDecodeError:
-                data = []
+    if orjson:
+        # OPT_APPEND_NEWLINE avoids concatenating a second bytes object
+        line = orjson.dumps(
+            result,
+            option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY,
+        )
+        with open(output_path, "ab") as f:
+            f.write(line)
     else:
-        data = []
+        result["timestamp"] = result["timestamp"].isoformat()
+        with open(output_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(result, ensure_ascii=False) + "\n")
+
 
-    data.append(result)
+def load_recommendations(output_path: str = "outputs/recommendations.jsonl") -> List[Dict[str, Any]]:
+    """
+    Load saved recommendation results written by save_recommendations.
+    """
+    if not os.path.exists(output_path):
+        return []
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    loads = orjson.loads if orjson else json.loads
+    with open(output_path, "rb") as f:
+        return [loads(line) for line in f if line.strip()]
 
 
 # --------------------------
 # Data Loading & Formatting
 # --------------------------
 
+# Declared up front so read_csv skips type inference on the text columns.
+# level/category are low-cardinality filter columns: stored as categoricals,
+# they compare as integer codes and take ~1 byte/row.
+_COURSE_DTYPES = {
+    "title": str,
+    "skills": str,
+    "description": str,
+    "level": "category",
+    "category": "category",
+}
+
+
 def load_courses(csv_path: str) -> pd.DataFrame:
     """
     Load courses from CSV file.
+    Parsed frames are cached per (path, mtime, size), so repeated loads of an
+    unchanged file skip the parse; callers get their own copy.
     """
     if not os.path.exists(csv_path):
         raise FileNotFoundError(f"Courses file not found: {csv_path}")
 
-    df = pd.read_csv(csv_path)
+    st = os.stat(csv_path)
+    return _load_courses_cached(os.path.abspath(csv_path), st.st_mtime_ns, st.st_size).copy()
+
+
+@lru_cache(maxsize=4)
+def _load_courses_cached(csv_path: str, mtime_ns: int, size: int) -> pd.DataFrame:
+    df = pd.read_csv(csv_path, engine=_CSV_ENGINE, dtype=_COURSE_DTYPES)
 
     required_cols = [
         "course_id",
@@ -119,8 +168,46 @@ def load_courses(csv_path: str) -> pd.DataFrame:
     return df
 
 
-def format_course_text(row: pd.Series) -> str:
+def _new_hasher():
+    """xxh3 when available (much faster than md5), md5 otherwise."""
+    return xxhash.xxh3_64() if xxhash else hashlib.md5()
+
+
+def get_dataset_hash_from_path(csv_path: str) -> str:
+    """
+    Cheap dataset key from file metadata (path, mtime, size), so service
+    restarts can reuse cached embeddings without reading or hashing the file.
+    Any edit to the CSV changes the key.
+    """
+    st = os.stat(csv_path)
+    key = f"{os.path.abspath(csv_path)}:{st.st_mtime_ns}:{st.st_size}"
+    return hashlib.md5(key.encode("utf-8")).hexdigest()
+
+
+def get_dataset_hash(df: pd.DataFrame) -> str:
+    """
+    Content hash of a courses DataFrame, used to key cached embeddings
+    when there is no source file (e.g. the built-in fallback data).
+    Row order does not affect the result.
+    """
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy(dtype=np.uint64)
+    # Order-independent fold of the per-row hashes (wrapping uint64 sum rather
+    # than XOR, so duplicated rows don't cancel out)
+    folded = int(row_hashes.sum(dtype=np.uint64))
+    hasher = _new_hasher()
+    hasher.update(f"{list(df.columns)}:{len(df)}:{folded}".encode("utf-8"))
+    return hasher.hexdigest()
+
+
+def format_course_texts(df: pd.DataFrame) -> pd.Series:
     """
-    Format course information into a single text for embedding.
+    Format each course as "<title>. Skills: <skills>. <description>", the
+    text that gets embedded. Missing fields become empty strings.
     """
-    return f"{row['title']}. Skills: {row['skills']}. {row['description']}"
+    return (
+        df["title"].fillna("").astype(str)
+        + ". Skills: "
+        + df["skills"].fillna("").astype(str)
+        + ". "
+        + df["description"].fillna("").astype(str)
+    )
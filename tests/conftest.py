@@ -0,0 +1,9 @@
+import pytest
+
+
+@pytest.fixture(scope="session")
+def pipeline():
+    """One CourseRecommenderPipeline (index, data, embedding model) shared by all test modules."""
+    # Imported lazily so suites that don't use the pipeline don't pay for faiss/torch
+    from src.ai.pipeline import CourseRecommenderPipeline
+    return CourseRecommenderPipeline()
@@ -1,12 +1,16 @@
 import requests
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 BASE_URL = "http://localhost:8001"
 
+# One keep-alive connection pool for the whole run instead of a new connection per check
+session = requests.Session()
+
 def test_health():
     print("Testing /health...")
-    resp = requests.get(f"{BASE_URL}/health")
+    resp = session.get(f"{BASE_URL}/health")
     assert resp.status_code == 200
     data = resp.json()
     assert data["status"] == "healthy"
@@ -14,7 +18,7 @@ def test_health():
 
 def test_catalog_weekly():
     print("Testing /reports/catalog-weekly...")
-    resp = requests.get(f"{BASE_URL}/reports/catalog-weekly")
+    resp = session.get(f"{BASE_URL}/reports/catalog-weekly")
     assert resp.status_code == 200
     data = resp.json()
     assert "kpis" in data
@@ -23,7 +27,7 @@ def test_catalog_weekly():
 
 def test_dashboard_png():
     print("Testing /reports/catalog-weekly/dashboard.png...")
-    resp = requests.get(f"{BASE_URL}/reports/catalog-weekly/dashboard.png")
+    resp = session.get(f"{BASE_URL}/reports/catalog-weekly/dashboard.png")
     assert resp.status_code == 200
     assert resp.headers["Content-Type"] == "image/png"
     assert len(resp.content) > 1000 # Should be at least 1KB
@@ -31,7 +35,7 @@ def test_dashboard_png():
 
 def test_report_html():
     print("Testing /reports/catalog-weekly/html...")
-    resp = requests.get(f"{BASE_URL}/reports/catalog-weekly/html")
+    resp = session.get(f"{BASE_URL}/reports/catalog-weekly/html")
     assert resp.status_code == 200
     assert "text/html" in resp.headers["Content-Type"]
     assert "Weekly Catalogue Intelligence Report" in resp.text
@@ -39,7 +43,7 @@ def test_report_html():
 
 def test_report_pdf():
     print("Testing /reports/catalog-weekly/pdf...")
-    resp = requests.get(f"{BASE_URL}/reports/catalog-weekly/pdf")
+    resp = session.get(f"{BASE_URL}/reports/catalog-weekly/pdf")
     assert resp.status_code == 200
     assert resp.headers["Content-Type"] == "application/pdf"
     assert resp.content.startswith(b"%PDF-")
@@ -50,9 +54,11 @@ def run_tests():
     try:
         test_health()
         test_catalog_weekly()
-        test_dashboard_png()
-        test_report_html()
-        test_report_pdf()
+        # The rendered reports are independent of each other; run them side by side
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            futures = [pool.submit(t) for t in (test_dashboard_png, test_report_html, test_report_pdf)]
+            for future in futures:
+                future.result()
         print("\n🏆 ALL TESTS PASSED!")
     except Exception as e:
         print(f"\n❌ TEST FAILED: {str(e)}")
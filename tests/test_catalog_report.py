@@ -0,0 +1,95 @@
+import pandas as pd
+import pytest
+from unittest.mock import patch
+from src.report import catalog_weekly
+from src.report.catalog_weekly import _count_entities, build_catalog_weekly_report, clear_report_cache
+
+COURSES = [
+    {"level": "Beginner", "categories": [{"id": 1, "name": "Python"}], "instructors": [{"id": 7, "name": "Sara"}]},
+    {"level": "Advanced", "categories": [{"id": 2, "name": "Data"}], "instructors": [{"id": 7, "name": "Sara"}]},
+]
+
+
+@pytest.fixture
+def client():
+    clear_report_cache()
+    with patch("src.report.catalog_weekly.ZednyClient") as mock:
+        instance = mock.return_value
+        instance.get_all_courses.return_value = COURSES
+        yield instance
+    clear_report_cache()
+
+
+def test_count_entities_counts_in_first_seen_order():
+    column = pd.Series([
+        [{"id": 2, "name": "Data"}, {"id": 1, "name": "Python"}],
+        [{"id": 1, "name": "Python (renamed)"}],
+        None,
+        [],
+    ])
+    assert _count_entities(column) == {
+        2: {"name": "Data", "count": 1},
+        1: {"name": "Python", "count": 2},
+    }
+    assert list(_count_entities(column)) == [2, 1]
+
+
+def test_count_entities_skips_empty_and_idless_entries():
+    column = pd.Series([[None, {}, {"name": "No id"}, {"id": 0, "name": "Zero"}, {"id": "", "name": "Blank"}]])
+    assert _count_entities(column) == {}
+
+
+def test_count_entities_name_defaults():
+    column = pd.Series([[{"id": "a"}, {"id": "b", "name": None}], [{"id": "b", "name": "Later"}]])
+    counts = _count_entities(column)
+    # A missing name becomes "Unknown"; an explicit None is kept as-is
+    assert counts["a"] == {"name": "Unknown", "count": 1}
+    assert counts["b"] == {"name": None, "count": 2}
+
+
+def test_report_cache_serves_repeat_builds(client):
+    first = build_catalog_weekly_report(top_n=5, bottom_n=5)
+    second = build_catalog_weekly_report(top_n=5, bottom_n=5)
+    assert first == second
+    assert client.get_all_courses.call_count == 1
+
+    build_catalog_weekly_report(top_n=3, bottom_n=5)
+    assert client.get_all_courses.call_count == 2
+
+
+def test_report_cache_returns_copies(client):
+    first = build_catalog_weekly_report()
+    first["kpis"]["total_courses"] = -1
+    first["top_categories"].clear()
+
+    second = build_catalog_weekly_report()
+    assert second["kpis"]["total_courses"] == 2
+    assert second["top_categories"]
+
+
+def test_report_cache_expires_after_ttl(client, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(catalog_weekly.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(catalog_weekly.settings, "REPORT_CACHE_TTL_SECONDS", 60)
+
+    build_catalog_weekly_report()
+    now[0] += 59
+    build_catalog_weekly_report()
+    assert client.get_all_courses.call_count == 1
+
+    now[0] += 2
+    build_catalog_weekly_report()
+    assert client.get_all_courses.call_count == 2
+
+
+def test_report_cache_disabled_and_cleared(client, monkeypatch):
+    monkeypatch.setattr(catalog_weekly.settings, "REPORT_CACHE_TTL_SECONDS", 0)
+    build_catalog_weekly_report()
+    build_catalog_weekly_report()
+    assert client.get_all_courses.call_count == 2
+
+    monkeypatch.setattr(catalog_weekly.settings, "REPORT_CACHE_TTL_SECONDS", 900)
+    build_catalog_weekly_report()
+    clear_report_cache()
+    build_catalog_weekly_report()
+    assert client.get_all_courses.call_count == 4
@@ -0,0 +1,66 @@
+import threading
+import time
+import pytest
+from src.scraper import client as scraper_client
+from src.zedny import client as zedny_client
+
+
+@pytest.fixture(params=[scraper_client, zedny_client], ids=["scraper", "zedny"])
+def client_module(request):
+    return request.param
+
+
+def make_client(module, monkeypatch, page_fn):
+    client = module.ZednyClient(base_url="https://example.test", token="t")
+    monkeypatch.setattr(client, "get_courses", page_fn)
+    return client
+
+
+def test_get_all_courses_fetches_every_page_in_order(client_module, monkeypatch):
+    def get_courses(page=1, limit=50):
+        return {"results": [{"id": (page - 1) * 2 + i} for i in range(2)], "total": 7}
+
+    client = make_client(client_module, monkeypatch, get_courses)
+    courses = client.get_all_courses(limit=2)
+    assert [c["id"] for c in courses] == list(range(8))
+
+
+def test_get_all_courses_error_does_not_wait_for_inflight_pages(client_module, monkeypatch):
+    release = threading.Event()
+
+    def get_courses(page=1, limit=50):
+        if page == 1:
+            return {"results": [{"id": 0}], "total": 10}
+        if page == 2:
+            raise client_module.ZednyClientError("boom")
+        release.wait(5)  # a slow page still in flight
+        return {"results": [{"id": page}], "total": 10}
+
+    client = make_client(client_module, monkeypatch, get_courses)
+    start = time.monotonic()
+    try:
+        with pytest.raises(client_module.ZednyClientError):
+            client.get_all_courses(limit=1)
+        assert time.monotonic() - start < 2
+    finally:
+        release.set()
+
+
+def test_get_all_courses_empty_page_does_not_wait_for_inflight_pages(client_module, monkeypatch):
+    release = threading.Event()
+
+    def get_courses(page=1, limit=50):
+        if page == 1:
+            return {"results": [{"id": 0}], "total": 10}
+        if page == 2:
+            return {"results": [], "total": 10}
+        release.wait(5)
+        return {"results": [{"id": page}], "total": 10}
+
+    client = make_client(client_module, monkeypatch, get_courses)
+    start = time.monotonic()
+    try:
+        assert client.get_all_courses(limit=1) == [{"id": 0}]
+        assert time.monotonic() - start < 2
+    finally:
+        release.set()
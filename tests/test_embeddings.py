@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from src.ai import embeddings
+from src.config import settings
+
+
+@pytest.fixture
+def fresh_service(monkeypatch):
+    """A new EmbeddingService singleton with class-level model state reset."""
+    for attr in ("_instance", "_model", "_onnx_model", "_tokenizer"):
+        monkeypatch.setattr(embeddings.EmbeddingService, attr, None)
+    monkeypatch.setattr(embeddings.EmbeddingService, "_onnx_attempted", False)
+    return embeddings.EmbeddingService
+
+
+def test_onnx_backend_does_not_need_torch(monkeypatch, fresh_service):
+    monkeypatch.setattr(settings, "EMBEDDING_BACKEND", "onnx")
+    monkeypatch.setattr(embeddings, "HAS_ML", False)
+    monkeypatch.setattr(embeddings, "HAS_ONNX", True)
+
+    def load_onnx(self):
+        self._onnx_model = object()
+    monkeypatch.setattr(fresh_service, "_load_onnx_model", load_onnx)
+    monkeypatch.setattr(fresh_service, "_encode_onnx", lambda self, texts: np.ones((len(texts), 4), dtype=np.float32))
+
+    service = fresh_service()
+    assert service.can_encode
+    assert service.encode("python").shape == (1, 4)
+
+
+def test_onnx_backend_never_falls_back_to_torch(monkeypatch, fresh_service):
+    monkeypatch.setattr(settings, "EMBEDDING_BACKEND", "onnx")
+    monkeypatch.setattr(embeddings, "HAS_ML", True)
+    monkeypatch.setattr(embeddings, "HAS_ONNX", True)
+    monkeypatch.setattr(fresh_service, "_load_onnx_model", lambda self: None)
+
+    service = fresh_service()
+    service.load_model()
+    assert not service.can_encode
+    assert service._model is None
+
+
+def test_onnx_backend_unavailable_without_onnxruntime(monkeypatch, fresh_service):
+    monkeypatch.setattr(settings, "EMBEDDING_BACKEND", "onnx")
+    monkeypatch.setattr(embeddings, "HAS_ML", True)
+    monkeypatch.setattr(embeddings, "HAS_ONNX", False)
+    assert not fresh_service().can_encode
+
+
+def test_each_backend_has_its_own_faiss_index(monkeypatch):
+    monkeypatch.setattr(settings, "EMBEDDING_BACKEND", "torch")
+    torch_index = settings.faiss_index_file
+    monkeypatch.setattr(settings, "EMBEDDING_BACKEND", "onnx")
+    onnx_index = settings.faiss_index_file
+
+    assert torch_index == settings.FAISS_INDEX_PATH
+    assert onnx_index != torch_index
+    assert onnx_index.parent == torch_index.parent
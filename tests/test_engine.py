@@ -0,0 +1,100 @@
+import os
+import numpy as np
+import pytest
+from src.ai import engine
+
+
+class FakeModel:
+    def __init__(self):
+        self.encode_calls = 0
+
+    def encode(self, texts, normalize_embeddings=True, **kwargs):
+        self.encode_calls += 1
+        rng = np.random.default_rng(len(texts))
+        vectors = rng.standard_normal((len(texts), 8)).astype(np.float32)
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+@pytest.fixture
+def recommender(monkeypatch, tmp_path):
+    monkeypatch.setattr(engine.settings, "EMBEDDINGS_CACHE_DIR", tmp_path)
+    monkeypatch.setattr(engine, "SentenceTransformer", lambda name: FakeModel())
+    return engine.CourseRecommender()
+
+
+def test_embeddings_path_keys_on_text_version_and_normalization(recommender, monkeypatch):
+    recommender.load_courses("missing.csv")
+    path = recommender._embeddings_path()
+    assert path.endswith(f"_t{engine.EMBEDDING_TEXT_VERSION}_norm.npy")
+
+    monkeypatch.setattr(engine, "EMBEDDING_TEXT_VERSION", engine.EMBEDDING_TEXT_VERSION + 1)
+    assert recommender._embeddings_path() != path
+
+
+def test_cached_embeddings_are_reused(recommender, tmp_path):
+    recommender.load_courses("missing.csv")
+    model = recommender.model
+    recommender.load_courses("missing.csv")
+    assert model.encode_calls == 1
+    assert len(list(tmp_path.glob("embeddings_*.npy"))) == 1
+
+
+def test_loading_leaves_other_caches_alone(recommender, tmp_path):
+    other_dataset = f"embeddings_{recommender.model_name}_0123abcd_t2_norm.npy"
+    np.save(tmp_path / other_dataset, np.zeros((1, 8), dtype=np.float32))
+
+    recommender.load_courses("missing.csv")
+
+    remaining = sorted(p.name for p in tmp_path.iterdir())
+    assert remaining == sorted([other_dataset, os.path.basename(recommender._embeddings_path())])
+
+
+def test_prune_keeps_most_recent_keys_per_model(tmp_path):
+    files = [
+        ("embeddings_m__a_00aa_t2_norm.npy", 1),
+        ("embeddings_m__a_00aa_t2_norm.i8.npy", 4),  # sidecar touched recently
+        ("embeddings_m__a_11bb_t2_norm.npy", 3),
+        ("embeddings_m__a_22cc.npy", 2),
+        ("embeddings_m__a_33dd_t1_norm.npy", 0),
+        ("embeddings_other_44ee_t2_norm.npy", 0),
+        ("notes.txt", 0),
+    ]
+    for name, mtime in files:
+        path = tmp_path / name
+        path.write_bytes(b"")
+        os.utime(path, (mtime, mtime))
+
+    removed = engine.prune_embedding_caches(str(tmp_path), keep=2)
+
+    assert sorted(removed) == ["embeddings_m__a_22cc.npy", "embeddings_m__a_33dd_t1_norm.npy"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted([
+        "embeddings_m__a_00aa_t2_norm.npy",
+        "embeddings_m__a_00aa_t2_norm.i8.npy",
+        "embeddings_m__a_11bb_t2_norm.npy",
+        "embeddings_other_44ee_t2_norm.npy",
+        "notes.txt",
+    ])
+
+
+def test_embeddings_are_replaced_not_rewritten_in_place(tmp_path):
+    path = str(tmp_path / "embeddings.npy")
+    old = np.arange(64, dtype=np.float32).reshape(8, 8)
+    np.save(path, old)
+    mapped = np.load(path, mmap_mode="r")
+
+    engine._save_npy_atomic(path, np.ones((2, 8), dtype=np.float32))
+
+    # The existing mapping still sees the complete old file
+    assert np.array_equal(mapped, old)
+    assert np.load(path).shape == (2, 8)
+    assert os.listdir(tmp_path) == ["embeddings.npy"]
+
+
+def test_int8_sidecar_is_written_next_to_float_cache(recommender, tmp_path):
+    if engine.simsimd is None:
+        pytest.skip("simsimd not installed")
+    recommender.use_int8 = True
+    recommender.load_courses("missing.csv")
+    i8_path = recommender._embeddings_path()[:-len(".npy")] + ".i8.npy"
+    assert np.array_equal(np.load(i8_path), recommender.embeddings_i8)
+    assert not [p for p in os.listdir(tmp_path) if p.endswith(".tmp")]
@@ -0,0 +1,164 @@
+import asyncio
+import math
+import pytest
+from src.report import pdf_renderer
+
+
+class FakePage:
+    async def set_content(self, html, wait_until=None):
+        pass
+
+    async def emulate_media(self, media=None):
+        pass
+
+    async def pdf(self, **kwargs):
+        return b"%PDF-fake"
+
+    async def close(self):
+        pass
+
+
+class FakeContext:
+    def __init__(self, browser, fail_new_page):
+        self.browser = browser
+        self.fail_new_page = fail_new_page
+        self.closed = False
+
+    async def new_page(self):
+        if self.fail_new_page:
+            # Let other requests queue up on the pool before failing
+            await asyncio.sleep(0.01)
+            raise RuntimeError("browser crashed")
+        return FakePage()
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    """fail_new_page / fail_new_context: True for every call, or an int for the first N."""
+
+    def __init__(self, fail_new_page=False, fail_new_context=0):
+        self.fail_new_page = fail_new_page
+        self.fail_new_context = fail_new_context
+        self.contexts = []
+
+    def is_connected(self):
+        return True
+
+    async def new_context(self):
+        if self.fail_new_context:
+            self.fail_new_context -= 1
+            await asyncio.sleep(0.01)
+            raise RuntimeError("could not create context")
+        fail = self.fail_new_page is True or len(self.contexts) < self.fail_new_page
+        ctx = FakeContext(self, fail)
+        self.contexts.append(ctx)
+        return ctx
+
+
+@pytest.fixture
+def fake_browser(monkeypatch):
+    def install(fail_new_page=False, fail_new_context=0, pool_size=2):
+        browser = FakeBrowser(fail_new_page, fail_new_context)
+
+        async def get_browser():
+            return browser
+
+        monkeypatch.setattr(pdf_renderer, "_get_browser", get_browser)
+        monkeypatch.setattr(pdf_renderer, "_CONTEXT_POOL", pdf_renderer._ContextPool(pool_size))
+        return browser
+    return install
+
+
+def test_html_to_pdf_reuses_pooled_context(fake_browser):
+    browser = fake_browser()
+
+    async def run():
+        return [await pdf_renderer.html_to_pdf("<p>hi</p>") for _ in range(3)]
+
+    assert asyncio.run(run()) == [b"%PDF-fake"] * 3
+    assert len(browser.contexts) == 1
+
+
+def test_new_page_failure_does_not_leak_pool_slots(fake_browser):
+    browser = fake_browser(fail_new_page=True)
+
+    async def run():
+        for _ in range(3):
+            with pytest.raises(RuntimeError):
+                await asyncio.wait_for(pdf_renderer.html_to_pdf("<p>hi</p>"), timeout=2)
+
+    asyncio.run(run())
+    # Every broken context was closed rather than returned to the pool
+    assert len(browser.contexts) == 3
+    assert all(ctx.closed for ctx in browser.contexts)
+
+
+def test_discarded_slot_wakes_waiting_request(fake_browser):
+    browser = fake_browser(fail_new_page=1, pool_size=1)
+
+    async def run():
+        first = asyncio.create_task(pdf_renderer.html_to_pdf("<p>a</p>"))
+        second = asyncio.create_task(pdf_renderer.html_to_pdf("<p>b</p>"))
+        with pytest.raises(RuntimeError):
+            await first
+        # The second request was queued behind the broken context
+        return await asyncio.wait_for(second, timeout=2)
+
+    assert asyncio.run(run()) == b"%PDF-fake"
+    assert browser.contexts[0].closed
+
+
+def test_failed_context_creation_wakes_waiting_request(fake_browser):
+    fake_browser(fail_new_context=1, pool_size=1)
+
+    async def run():
+        first = asyncio.create_task(pdf_renderer.html_to_pdf("<p>a</p>"))
+        second = asyncio.create_task(pdf_renderer.html_to_pdf("<p>b</p>"))
+        with pytest.raises(RuntimeError):
+            await first
+        return await asyncio.wait_for(second, timeout=2)
+
+    assert asyncio.run(run()) == b"%PDF-fake"
+
+
+def test_bytecode_cache_defaults_to_private_user_dir(monkeypatch):
+    monkeypatch.setattr(pdf_renderer.settings, "ZEDNY_JINJA_CACHE_DIR", None)
+    cache = pdf_renderer._build_environment().bytecode_cache
+    assert cache is not None
+    assert pdf_renderer._is_private_dir(cache.directory)
+
+
+def test_bytecode_cache_rejects_shared_dir(monkeypatch, tmp_path):
+    shared = tmp_path / "jinja"
+    shared.mkdir()
+    shared.chmod(0o777)
+    monkeypatch.setattr(pdf_renderer.settings, "ZEDNY_JINJA_CACHE_DIR", str(shared))
+    assert pdf_renderer._build_environment().bytecode_cache is None
+
+    shared.chmod(0o700)
+    assert pdf_renderer._build_environment().bytecode_cache is not None
+
+
+def test_bytecode_cache_can_be_disabled(monkeypatch):
+    monkeypatch.setattr(pdf_renderer.settings, "ZEDNY_JINJA_CACHE_DIR", "")
+    assert pdf_renderer._build_environment().bytecode_cache is None
+
+
+def test_donut_chart_arcs_follow_running_angle():
+    svg = pdf_renderer.generate_donut_chart_svg(["A", "B", "C"], [1, 2, 3])
+    angle = 0.0
+    for value in (1, 2, 3):
+        slice_angle = value / 6 * 2 * math.pi
+        x1, y1 = 125 + 80 * math.cos(angle), 125 + 80 * math.sin(angle)
+        x2, y2 = 125 + 80 * math.cos(angle + slice_angle), 125 + 80 * math.sin(angle + slice_angle)
+        assert f'd="M {x1} {y1} A 80 80 0 0 1 {x2} {y2}"' in svg
+        angle += slice_angle
+    assert "C (50%)" in svg
+    assert svg.startswith("<svg") and svg.endswith("</svg>")
+
+
+def test_donut_chart_empty_and_zero_total():
+    assert pdf_renderer.generate_donut_chart_svg([], []) == ""
+    assert "<path" not in pdf_renderer.generate_donut_chart_svg(["A"], [0])
@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.ai import pipeline as pipeline_module
+from src.data_loader import add_lowercase_columns
+from src.schemas import RecommendRequest
+
+
+def make_courses():
+    return add_lowercase_columns(pd.DataFrame({
+        "course_id": [1, 2, 3, 4],
+        "title": ["Python Basics", "Java Intro", "Advanced Python", "Cooking"],
+        "skills": ["python", "java", "python|pandas", None],
+        "description": ["learn python", "java course", "deep python", "food"],
+        "category": ["Prog", "Prog", "Data", "Life"],
+        "level": ["Beginner", "Beginner", "Advanced", "Beginner"],
+    }))
+
+
+class FakeIndex:
+    """Returns every course, best match first, with fixed scores."""
+
+    def __init__(self):
+        self.searches = 0
+
+    def search(self, query_vector, k):
+        self.searches += 1
+        return np.array([[0.9, 0.8, 0.7, 0.6]]), np.array([[0, 2, 1, 3]])
+
+
+class FakeEmbeddingService:
+    can_encode = True
+
+    def encode(self, texts):
+        return np.zeros((1, 4), dtype=np.float32)
+
+    def rerank(self, query, candidates):
+        return np.zeros(len(candidates))
+
+
+@pytest.fixture
+def stub_pipeline(monkeypatch):
+    """CourseRecommenderPipeline over a 4-course in-memory catalogue (no faiss/torch)."""
+    index, courses = FakeIndex(), make_courses()
+    monkeypatch.setattr(pipeline_module.DataLoader, "load_data", lambda self: (index, courses))
+    monkeypatch.setattr(pipeline_module, "EmbeddingService", FakeEmbeddingService)
+    return pipeline_module.CourseRecommenderPipeline()
+
+
+def test_count_only_returns_total_without_results(stub_pipeline):
+    res = stub_pipeline.recommend(RecommendRequest(query="Python", top_k=1, count_only=True))
+    assert res.results == []
+    assert res.debug_info["count_only"] is True
+    # Counts every gated match, not capped by top_k
+    assert res.total_found == 2
+
+
+def test_count_only_matches_full_result_count(stub_pipeline):
+    full = stub_pipeline.recommend(RecommendRequest(query="Python", top_k=10))
+    count = stub_pipeline.recommend(RecommendRequest(query="Python", top_k=10, count_only=True))
+    assert [r.title for r in full.results] == ["Python Basics", "Advanced Python"]
+    assert count.total_found == full.total_found
+
+
+def test_query_cache_key_normalizes_query(stub_pipeline):
+    key = stub_pipeline._cache_key
+    assert key(RecommendRequest(query="Python!")) == key(RecommendRequest(query="  python "))
+    assert key(RecommendRequest(query="python")) != key(RecommendRequest(query="python", top_k=5))
+    assert key(RecommendRequest(query="python")) != key(RecommendRequest(query="python", count_only=True))
+    assert key(RecommendRequest(query="python")) != key(RecommendRequest(query="python", enable_reranking=True))
+    assert key(RecommendRequest(query="python", filters={"level": "Beginner", "category": "Prog"})) == \
+        key(RecommendRequest(query="python", filters={"category": "Prog", "level": "Beginner"}))
+    assert key(RecommendRequest(query="python", filters={"level": "Beginner"})) != \
+        key(RecommendRequest(query="python", filters={"level": "Advanced"}))
+
+
+def test_query_cache_hit_skips_search(stub_pipeline):
+    first = stub_pipeline.recommend(RecommendRequest(query="Python", top_k=5))
+    second = stub_pipeline.recommend(RecommendRequest(query="python?", top_k=5))
+
+    assert stub_pipeline.index.searches == 1
+    assert second.results == first.results
+    assert second.total_found == first.total_found
+    assert second.debug_info["cache_hit"] is True
+    assert second.debug_info["original_query"] == "python?"
+    assert "cache_hit" not in first.debug_info
+
+
+def test_query_cache_returns_independent_copies(stub_pipeline):
+    req = RecommendRequest(query="Python", top_k=5)
+    first = stub_pipeline.recommend(req)
+    first.results[0].matched_keywords.append("mutated")
+    first.results.pop()
+
+    second = stub_pipeline.recommend(req)
+    second.results.clear()
+
+    third = stub_pipeline.recommend(req)
+    assert [r.title for r in third.results] == ["Python Basics", "Advanced Python"]
+    assert "mutated" not in third.results[0].matched_keywords
+
+
+def test_query_cache_misses_when_dataset_hash_changes(stub_pipeline):
+    req = RecommendRequest(query="Python", top_k=5)
+    stub_pipeline.recommend(req)
+    stub_pipeline.dataset_hash = "rebuilt"
+    stub_pipeline.recommend(req)
+    assert stub_pipeline.index.searches == 2
+
+
+def test_query_cache_is_bounded_lru(stub_pipeline, monkeypatch):
+    monkeypatch.setattr(pipeline_module, "QUERY_CACHE_SIZE", 2)
+    for q in ("python", "java", "python", "pandas"):
+        stub_pipeline.recommend(RecommendRequest(query=q, top_k=5))
+    assert stub_pipeline.index.searches == 3
+
+    # "java" was least recently used and got evicted; "python" is still cached
+    stub_pipeline.recommend(RecommendRequest(query="python", top_k=5))
+    assert stub_pipeline.index.searches == 3
+    stub_pipeline.recommend(RecommendRequest(query="java", top_k=5))
+    assert stub_pipeline.index.searches == 4
+
+
+def test_clear_query_cache(stub_pipeline):
+    req = RecommendRequest(query="Python", top_k=5)
+    stub_pipeline.recommend(req)
+    stub_pipeline.clear_query_cache()
+    stub_pipeline.recommend(req)
+    assert stub_pipeline.index.searches == 2
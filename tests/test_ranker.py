@@ -0,0 +1,17 @@
+import numpy as np
+from src.ai.ranker import top_k_indices, normalize_rank_1_10
+
+def test_top_k_indices_matches_full_sort():
+    scores = np.array([0.1, 0.9, 0.4, 0.7, 0.3, 0.8])
+    idx = top_k_indices(scores, 3)
+    assert idx.tolist() == [1, 5, 3]
+
+def test_top_k_indices_k_larger_than_input():
+    scores = np.array([0.2, 0.5, 0.1])
+    assert top_k_indices(scores, 10).tolist() == [1, 0, 2]
+    assert len(top_k_indices(scores, 0)) == 0
+
+def test_normalize_rank_range():
+    results = normalize_rank_1_10([{"score": s} for s in [0.2, 0.5, 0.9]])
+    ranks = [r["rank"] for r in results]
+    assert ranks[0] == 1 and ranks[-1] == 10
@@ -1,12 +1,7 @@
 import pytest
-from src.pipeline import CourseRecommenderPipeline
 from src.schemas import RecommendRequest
 import pytest
 
-@pytest.fixture(scope="module")
-def pipeline():
-    return CourseRecommenderPipeline()
-
 def test_strict_python_match(pipeline):
     """Query: 'Python' must return only courses mentioning Python"""
     req = RecommendRequest(query="Python", top_k=10)
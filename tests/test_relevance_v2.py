@@ -1,11 +1,6 @@
 import pytest
-from src.pipeline import CourseRecommenderPipeline
 from src.schemas import RecommendRequest
 
-@pytest.fixture(scope="module")
-def pipeline():
-    return CourseRecommenderPipeline()
-
 def test_strict_keyword_short_query(pipeline):
     """
     Test: Single keyword query 'Python' must strictly return courses with 'Python'.
@@ -1,12 +1,7 @@
 
 import pytest
-from src.pipeline import CourseRecommenderPipeline
 from src.schemas import RecommendRequest
 
-@pytest.fixture(scope="module")
-def pipeline():
-    return CourseRecommenderPipeline()
-
 def test_strict_php_arabic(pipeline):
     """Test: 'بي اتش بي' -> PHP courses."""
     # Our map converts 'بي اتش بي' -> 'php'
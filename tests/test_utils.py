@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src import utils
+
+
+@pytest.fixture(params=["orjson", "json"])
+def serializer(request, monkeypatch):
+    if request.param == "orjson" and utils.orjson is None:
+        pytest.skip("orjson not installed")
+    if request.param == "json":
+        monkeypatch.setattr(utils, "orjson", None)
+    return request.param
+
+
+def test_recommendations_jsonl_round_trip(serializer, tmp_path):
+    path = str(tmp_path / "history" / "recommendations.jsonl")
+    assert utils.load_recommendations(path) == []
+
+    utils.save_recommendations("python", {"level": "Beginner"}, [{"title": "Python Basics", "score": 0.9}], path)
+    utils.save_recommendations("تعلم الآلة", {}, [], path)
+
+    records = utils.load_recommendations(path)
+    assert [r["user_query"] for r in records] == ["python", "تعلم الآلة"]
+    assert records[0]["filters"] == {"level": "Beginner"}
+    assert records[0]["recommended_courses"] == [{"title": "Python Basics", "score": 0.9}]
+    assert records[1]["recommended_courses"] == []
+    assert all(isinstance(r["timestamp"], str) for r in records)
+
+    # One record per line, appended rather than rewritten
+    with open(path, encoding="utf-8") as f:
+        assert len(f.read().splitlines()) == 2
+
+
+def test_recommendations_accept_numpy_scores(tmp_path):
+    if utils.orjson is None:
+        pytest.skip("orjson not installed")
+    path = str(tmp_path / "recommendations.jsonl")
+    utils.save_recommendations("python", {}, [{"score": np.float32(0.5), "ids": np.arange(2)}], path)
+    assert utils.load_recommendations(path)[0]["recommended_courses"] == [{"score": 0.5, "ids": [0, 1]}]
+
+
+def test_format_course_texts_blanks_missing_fields():
+    df = pd.DataFrame({
+        "title": ["Python Basics", "Cooking"],
+        "skills": ["python|pandas", None],
+        "description": ["learn python", float("nan")],
+    })
+    assert utils.format_course_texts(df).tolist() == [
+        "Python Basics. Skills: python|pandas. learn python",
+        "Cooking. Skills: . ",
+    ]